@@ -3,6 +3,9 @@
  * Zero dependencies beyond libc + POSIX.  Renders in ~3ms.
  */
 #define _DARWIN_C_SOURCE
+#ifndef _GNU_SOURCE
+#define _GNU_SOURCE  /* glibc: POSIX_SPAWN_SETSID */
+#endif
 #include "pager.h"
 
 #include <ctype.h>
@@ -14,6 +17,7 @@
 #include <string.h>
 #include <strings.h>
 #include <limits.h>
+#include <spawn.h>
 #include <sys/file.h>
 #include <sys/ioctl.h>
 #include <sys/select.h>
@@ -24,6 +28,14 @@
 #include <time.h>
 #include <unistd.h>
 #include <errno.h>
+#if defined(__APPLE__)
+#include <sys/event.h>
+#elif defined(__linux__)
+#include <sys/inotify.h>
+#include <sys/syscall.h>
+#endif
+
+extern char **environ;
 
 /* ── ANSI ──────────────────────────────────────────────────────────────── */
 
@@ -91,6 +103,8 @@
 /* ── Globals ───────────────────────────────────────────────────────────── */
 
 static int g_cols = 100, g_rows = 24, g_crows = 21;
+/* g_cols is the real terminal width: a row that fills it needs no \033[K. */
+static int g_cols_full = 0;
 static int g_fd = -1;
 static struct termios g_old;
 static volatile sig_atomic_t g_resize = 0, g_quit = 0;
@@ -527,6 +541,7 @@ static void geo_update(void) {
         if (clamp > 0 && cols > clamp) cols = clamp;
         g_cols = cols;
         g_rows = (int)ws.ws_row;
+        g_cols_full = (cols == (int)ws.ws_col);
     }
     int qr = g_queue_rows;
     int qr_cap = g_rows - 4;
@@ -538,10 +553,34 @@ static void geo_update(void) {
     if (g_crows < 1) g_crows = 1;
 }
 
-static void on_winch(int s) { (void)s; g_resize = 1; }
-static void on_term(int s)  { (void)s; g_quit = 1; }
+/* Self-pipe: a signal that lands between the main loop's flag checks
+ * and select() would otherwise wait out the full poll timeout. */
+static int g_wake_fd[2] = {-1, -1};
+
+static void wake_main_loop(void) {
+    if (g_wake_fd[1] < 0) return;
+    int saved = errno;
+    ssize_t w = write(g_wake_fd[1], "", 1);
+    (void)w;
+    errno = saved;
+}
+
+static void drain_wake_fd(void) {
+    char b[64];
+    while (read(g_wake_fd[0], b, sizeof(b)) > 0) {}
+}
+
+static void on_winch(int s) { (void)s; g_resize = 1; wake_main_loop(); }
+static void on_term(int s)  { (void)s; g_quit = 1; wake_main_loop(); }
 
 static void install_signal_handlers(void) {
+    if (g_wake_fd[0] < 0 && pipe(g_wake_fd) == 0) {
+        for (int i = 0; i < 2; i++) {
+            fcntl(g_wake_fd[i], F_SETFL, fcntl(g_wake_fd[i], F_GETFL) | O_NONBLOCK);
+            fcntl(g_wake_fd[i], F_SETFD, FD_CLOEXEC);
+        }
+    }
+
     struct sigaction sa_term;
     memset(&sa_term, 0, sizeof(sa_term));
     sa_term.sa_handler = on_term;
@@ -591,6 +630,9 @@ static void ob(const char *s) {
     ob_raw(s, (int)strlen(s));
 }
 
+/* String literals only: length comes from sizeof, no strlen. */
+#define OB_LIT(s) ob_raw("" s, (int)sizeof(s) - 1)
+
 static void obf(const char *fmt, ...) {
     if (!fmt) return;
     va_list ap;
@@ -1133,27 +1175,36 @@ static int queue_assets_dir(char *out, size_t outlen) {
 
 static int queue_export_clipboard_png(const char *dst_path) {
     if (!dst_path || !*dst_path) return -1;
-    pid_t pid = fork();
-    if (pid < 0) return -1;
-    if (pid == 0) {
-        execlp(
-            "osascript", "osascript",
-            "-e", "on run argv",
-            "-e", "set outPath to item 1 of argv",
-            "-e", "set imgData to the clipboard as «class PNGf»",
-            "-e", "set fRef to open for access POSIX file outPath with write permission",
-            "-e", "set eof fRef to 0",
-            "-e", "write imgData to fRef",
-            "-e", "close access fRef",
-            "-e", "end run",
-            "--",
-            dst_path,
-            (char *)NULL
-        );
-        _exit(127);
-    }
+    /* posix_spawn rather than fork: the pager may be holding a large
+     * transcript and render buffer, and there is nothing to do in the
+     * child before exec. */
+    char *argv[] = {
+        "osascript",
+        "-e", "on run argv",
+        "-e", "set outPath to item 1 of argv",
+        "-e", "set imgData to the clipboard as «class PNGf»",
+        "-e", "set fRef to open for access POSIX file outPath with write permission",
+        "-e", "set eof fRef to 0",
+        "-e", "write imgData to fRef",
+        "-e", "close access fRef",
+        "-e", "end run",
+        "--",
+        (char *)dst_path,
+        NULL
+    };
+    /* Output is never read; keep osascript's errors off the pager's tty. */
+    posix_spawn_file_actions_t fa;
+    if (posix_spawn_file_actions_init(&fa) != 0) return -1;
+    posix_spawn_file_actions_addopen(&fa, STDOUT_FILENO, "/dev/null", O_WRONLY, 0);
+    posix_spawn_file_actions_addopen(&fa, STDERR_FILENO, "/dev/null", O_WRONLY, 0);
+    pid_t pid;
+    int rc = posix_spawnp(&pid, "osascript", &fa, NULL, argv, environ);
+    posix_spawn_file_actions_destroy(&fa);
+    if (rc != 0) return -1;
     int status = 0;
-    if (waitpid(pid, &status, 0) < 0) return -1;
+    while (waitpid(pid, &status, 0) < 0) {
+        if (errno != EINTR) return -1;
+    }
     if (!WIFEXITED(status)) return -1;
     return WEXITSTATUS(status) == 0 ? 0 : -1;
 }
@@ -2164,18 +2215,28 @@ static void L_set_limit(Lines *l, int max_keep) {
     }
 }
 
+/* Wrap continuation rows all point at this one string instead of each
+ * owning a 2-byte heap copy; L_line_free knows not to free it. */
+static char g_wrap_ph[] = WRAP_PLACEHOLDER;
+
+static void L_line_free(char *s) {
+    if (s != g_wrap_ph) free(s);
+}
+
 static int L_drop_head(Lines *l, int drop) {
     if (!l || drop <= 0 || l->n <= 0) return 0;
     if (drop > l->n) drop = l->n;
-    for (int i = 0; i < drop; i++) free(l->d[i]);
+    for (int i = 0; i < drop; i++) L_line_free(l->d[i]);
     memmove(l->d, l->d + drop, (size_t)(l->n - drop) * sizeof(char *));
     l->n -= drop;
     l->dropped_total += drop;
     return drop;
 }
 
-static void L_push(Lines *l, const char *s) {
-    if (!l || !s || g_oom) return;
+/* Append s as-is; the array takes ownership unless s is g_wrap_ph. */
+static void L_push_ptr(Lines *l, char *s) {
+    if (!l || !s) return;
+    if (g_oom) { L_line_free(s); return; }
     if (l->max_keep > 0) {
         int chunk = l->drop_chunk > 0 ? l->drop_chunk : 1;
         int high = l->max_keep + chunk;
@@ -2187,13 +2248,18 @@ static void L_push(Lines *l, const char *s) {
     if (l->n >= l->cap) {
         int ncap = l->cap ? l->cap * 2 : 128;
         char **nd = xrealloc(l->d, sizeof(char*) * (size_t)ncap);
-        if (!nd) return;
+        if (!nd) { L_line_free(s); return; }
         l->d = nd;
         l->cap = ncap;
     }
+    l->d[l->n++] = s;
+}
+
+static void L_push(Lines *l, const char *s) {
+    if (!l || !s || g_oom) return;
     char *cp = xstrdup(s);
     if (!cp) return;
-    l->d[l->n++] = cp;
+    L_push_ptr(l, cp);
 }
 
 static void L_push_blank_once(Lines *l) {
@@ -2222,50 +2288,307 @@ static void L_prepend(Lines *l, const char *s) {
     l->d[0] = cp;
     l->n++;
     if (l->max_keep > 0 && l->n > l->max_keep) {
-        free(l->d[l->n - 1]);
+        L_line_free(l->d[l->n - 1]);
         l->n--;
     }
 }
 
+/* Undo L_prepend: remove line 0 without counting it as dropped. */
+static void L_unprepend(Lines *l) {
+    if (!l || l->n <= 0) return;
+    L_line_free(l->d[0]);
+    memmove(l->d, l->d + 1, (size_t)(l->n - 1) * sizeof(char *));
+    l->n--;
+}
+
+static void L_truncate(Lines *l, int n) {
+    if (!l || n < 0) return;
+    while (l->n > n) L_line_free(l->d[--l->n]);
+}
+
 static void L_free(Lines *l) {
     if (!l) return;
     int keep = l->max_keep;
     int chunk = l->drop_chunk;
-    for (int i=0; i<l->n; i++) free(l->d[i]);
+    for (int i=0; i<l->n; i++) L_line_free(l->d[i]);
     free(l->d);
     L_init(l);
     l->max_keep = keep;
     l->drop_chunk = chunk;
 }
 
+/* ── Cell width ────────────────────────────────────────────────────────── */
+
+/* Two-stage bitmap of East_Asian_Width W/F code points (Unicode 14.0,
+ * assigned characters plus the default-wide CJK ranges), U+0000..U+3FFFF.
+ * Stage 1 maps cp>>8 to a 256-bit block in stage 2. */
+static const unsigned char g_wide_stage1[0x400] = {
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  1,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  2,  0,  3,  4,  5,  0,  0,  0,  6,  0,  0,  7,  8,
+      9, 10, 11, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 13, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 14,  0,  0,  0,  0, 15,  0,  0, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 16,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0, 12, 12,  0,  0,  0, 17, 18,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0, 19,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 20, 12, 12, 12, 12, 21, 22,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0, 23,
+     12, 24, 25,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+      0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,  0,
+     26, 27, 28, 29, 30, 31, 32, 33,  0, 34, 35,  0,  0,  0,  0,  0,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 36,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12,
+     12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 12, 36,
+};
+
+static const unsigned char g_wide_stage2[][32] = {
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0x00,0x00,0x00,0x0c,0x00,0x06,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x1e,0x09,0x00},
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x60},
+    {0x00,0x00,0x30,0x00,0x00,0x00,0x00,0x00,0x00,0xff,0x0f,0x00,0x00,0x00,0x00,0x80,
+     0x00,0x00,0x08,0x00,0x02,0x0c,0x00,0x60,0x30,0x40,0x10,0x00,0x00,0x04,0x2c,0x24},
+    {0x20,0x0c,0x00,0x00,0x00,0x01,0x00,0x00,0x00,0x50,0xb8,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0xe0,0x00,0x00,0x00,0x01,0x80,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0x00,0x00,0x00,0x18,0x00,0x00,0x00,0x00,0x00,0x00,0x21,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0xff,0xff,0xff,0xfb,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x0f,0x00},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x3f,0x00,0x00,0x00,0xff,0x0f},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x7f,0xfe,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0x7f,0xfe,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff},
+    {0xe0,0xff,0xff,0xff,0xff,0xff,0xfe,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0x7f,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x0f,0x00,0xff,0xff},
+    {0xff,0xff,0xff,0x7f,0xff,0xff,0xff,0xff,0xff,0x00,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0x1f,0xff,0xff,0xff,0xff,0xff,0xff,0x7f,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0xff,0xff,0xff,0x1f,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0x0f,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0x00,0x00,0xff,0x03,0x00,0x00,0xff,0xff,0xff,0xff,0xf7,0xff,0x7f,0x0f,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0xfe,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x01,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x7f,0x00,0x00,0x00},
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x1f,0x00,0x03,0x00},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x00},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x3f,0x00,0x00,0x00,0x00,0x00},
+    {0xff,0x01,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0xef,0x6f},
+    {0xff,0xff,0xff,0xff,0x07,0x00,0x00,0x00,0x00,0x00,0x07,0x00,0xf0,0x00,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x0f},
+    {0x10,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x80,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x40,0xfe,0x07,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0x07,0x00,0xff,0xff,0xff,0xff,0xff,0x0f,0xff,0x01,0x03,0x00,0x3f,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00},
+    {0xff,0xff,0xff,0xff,0x01,0xe0,0xbf,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xdf,
+     0xff,0xff,0x0f,0x00,0xff,0xff,0xff,0xff,0xff,0x87,0x0f,0x00,0xff,0xff,0x11,0xff},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x7f,0xfd,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x9f},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x3f,0x00,0x78,0xff,0xff,0xff,0x00,0x00,0x04,
+     0x00,0x00,0x60,0x00,0x10,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0xf8},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x00,0x00,0x00,0x00,0x00,0x00,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x3f,0x10,0xe7,0xe0,0x00,0x18,0xf0,0x1f},
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,
+     0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0xff,0x0f,0x01,0x00},
+    {0x00,0xf0,0xff,0xff,0xff,0xff,0xff,0xf7,0xbf,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff},
+    {0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x1f,0x1f,
+     0x7f,0x00,0xff,0xff,0xff,0x1f,0xff,0x07,0x3f,0x00,0xff,0x03,0xff,0x00,0x7f,0x00},
+    {0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,
+     0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0xff,0x3f},
+};
+
+static int cp_cells(unsigned cp) {
+    if (cp < 0x1100 || cp > 0x3FFFF) return 1;
+    unsigned lo = cp & 0xFF;
+    return (g_wide_stage2[g_wide_stage1[cp >> 8]][lo >> 3] >> (lo & 7)) & 1 ? 2 : 1;
+}
+
+/* Cells taken by the UTF-8 sequence s[0..n); a stray continuation or
+ * truncated sequence counts as one narrow cell. */
+static int utf8_cells(const char *str, int n) {
+    const unsigned char *s = (const unsigned char *)str;
+    if (n <= 1 || s[0] < 0xE1) return 1;
+    unsigned cp;
+    if (s[0] < 0xF0) {
+        if (n < 3) return 1;
+        cp = ((s[0] & 0x0Fu) << 12) | ((s[1] & 0x3Fu) << 6) | (s[2] & 0x3Fu);
+    } else {
+        if (n < 4) return 1;
+        cp = ((s[0] & 0x07u) << 18) | ((s[1] & 0x3Fu) << 12) |
+             ((s[2] & 0x3Fu) << 6) | (s[3] & 0x3Fu);
+    }
+    return cp_cells(cp);
+}
+
 /* ── ANSI-aware visible length ─────────────────────────────────────────── */
 
-static int vlen(const char *s) {
-    int n = 0;
-    while (*s) {
-        if (*s == '\033') {
-            s++;
-            if (*s=='[') { s++; while (*s && !isalpha((unsigned char)*s) && *s!='~') s++; if (*s) s++; }
-            else if (*s==']') {
-                while (*s) {
-                    if (*s=='\a') { s++; break; }
-                    if (s[0]=='\033' && s[1]=='\\') { s+=2; break; }
-                    s++;
-                }
+/* Length of the escape sequence at s[0] == ESC, at most n bytes, per
+ * ECMA-48: CSI is parameter bytes, intermediate bytes, one final byte;
+ * OSC runs to BEL or ST; DCS/SOS/PM/APC run to ST; anything else is
+ * ESC plus one byte.  A NUL also ends the sequence. */
+static int ansi_seq_len(const char *str, int n) {
+    const unsigned char *s = (const unsigned char *)str;
+    if (n < 2 || !s[1]) return 1;
+    unsigned char k = s[1];
+    int i = 2;
+    if (k == '[') {
+        while (i < n && s[i] >= 0x30 && s[i] <= 0x3F) i++;
+        while (i < n && s[i] >= 0x20 && s[i] <= 0x2F) i++;
+        if (i < n && s[i] >= 0x40 && s[i] <= 0x7E) i++;
+        return i;
+    }
+    if (k == ']' || k == 'P' || k == 'X' || k == '^' || k == '_') {
+        while (i < n && s[i]) {
+            if (k == ']' && s[i] == '\a') return i + 1;
+            if (s[i] == 0x1b && i + 1 < n && s[i + 1] == '\\') return i + 2;
+            i++;
+        }
+        return i;
+    }
+    return 2;
+}
+
+/* Byte classes for vlen: every single-byte character other than ESC is
+ * one cell, so the hot loop is one table load per byte. */
+enum { BC_END, BC_CELL, BC_ESC, BC_UTF8 };
+
+/* 0 = BC_END, 1 = BC_CELL, 2 = BC_ESC, 3 = BC_UTF8 */
+static const unsigned char g_byte_class[256] = {
+    0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 00 */
+    1,1,1,1,1,1,1,1,1,1,1,2,1,1,1,1,  /* 10 */
+    1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 20 */
+    1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 30 */
+    1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 40 */
+    1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 50 */
+    1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 60 */
+    1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 70 */
+    3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,  /* 80 */
+    3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,  /* 90 */
+    3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,  /* a0 */
+    3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,  /* b0 */
+    3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,  /* c0 */
+    3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,  /* d0 */
+    3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,  /* e0 */
+    3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,3,  /* f0 */
+};
+
+/* Visible cells outside escape sequences (wide code points take two).
+ * If rows is set, also the rows the line takes at g_cols, wrapped like
+ * the terminal (and link_map_track_line): a wide char that would
+ * straddle the last column starts the next row. */
+static int vlen(const char *str, int *rows) {
+    const unsigned char *s = (const unsigned char *)str;
+    int n = 0, r = 1, col = 0;
+    for (;;) {
+        const unsigned char *run = s;
+        while (g_byte_class[*s] == BC_CELL) s++;
+        int k = (int)(s - run);
+        if (k) {
+            n += k;
+            if (col >= g_cols) { r++; col = 0; }
+            col += k;
+            if (col > g_cols) {
+                r += (col - 1) / g_cols;
+                col = (col - 1) % g_cols + 1;
             }
-            else if (*s) s++;
-        } else { n++; s++; }
+        }
+        switch (g_byte_class[*s]) {
+        case BC_END:
+            if (rows) *rows = r;
+            return n;
+        case BC_ESC:
+            s += ansi_seq_len((const char *)s, INT_MAX);
+            break;
+        default: {
+            const unsigned char *q = s + 1;
+            while ((*q & 0xC0) == 0x80) q++;
+            int w = utf8_cells((const char *)s, (int)(q - s));
+            if (col + w > g_cols) { r++; col = 0; }
+            n += w;
+            col += w;
+            s = q;
+            break;
+        }
+        }
     }
-    return n;
 }
 
 static void L_pushw(Lines *l, const char *s) {
     L_push(l, s);
-    int v = vlen(s);
-    if (v > g_cols) {
-        int extra = (v + g_cols - 1) / g_cols - 1;
-        for (int i = 0; i < extra; i++) L_push(l, WRAP_PLACEHOLDER);
-    }
+    /* A cell never takes fewer bytes than it occupies, so short lines fit. */
+    if (strlen(s) <= (size_t)g_cols) return;
+    int rows;
+    vlen(s, &rows);
+    for (int i = 1; i < rows; i++) L_push_ptr(l, g_wrap_ph);
 }
 
 static int normalize_off_visual(const Lines *l, int off, int dir) {
@@ -2286,6 +2609,15 @@ static int normalize_off_visual(const Lines *l, int off, int dir) {
 
 /* ── OSC-8 linkification ──────────────────────────────────────────────── */
 
+/* Fixed pieces of an emitted hyperlink, joined at compile time:
+ * OSC8_OPEN <target> OSC8_*_MID <label> OSC8_CLOSE.  OSC8_END alone ends
+ * a link without the styling reset. */
+#define OSC8_OPEN     "\033]8;;"
+#define OSC8_END      "\033]8;;\a"
+#define OSC8_URL_MID  "\a" BO C_URL UL_ON
+#define OSC8_FILE_MID "\a" BO C_FLINK UL_ON
+#define OSC8_CLOSE    UL_OFF "\033[22m" OSC8_END
+
 static int is_urlch(char c) {
     if (c <= ' ') return 0;
     if (c=='<'||c=='>'||c=='"'||c=='\''||c=='\\'||c==')'||c=='}'||c==']') return 0;
@@ -2346,6 +2678,30 @@ static int uri_path_is_safe(const char *path, int plen);
 static void uri_encode_path(char *dst, int dstmax, const char *src, int srclen);
 static int expand_path_to_abs(char *dst, int dstmax, const char *path, int plen);
 
+/* ~-expanded or percent-encoded target: the slow path. */
+static int build_file_uri_target_encoded(char *dst, int dstmax, const char *path, int plen) {
+    char abs_path[8192];
+    int alen = expand_path_to_abs(abs_path, sizeof(abs_path), path, plen);
+    if (alen <= 0) return 0;
+
+    char enc[16384];
+    uri_encode_path(enc, sizeof(enc), abs_path, alen);
+    int n = snprintf(dst, (size_t)dstmax, "file://%s", enc);
+    return (n > 0 && n < dstmax) ? 1 : 0;
+}
+
+/* Re-renders linkify the same paths over and over; remember the last
+ * encoded target per hash slot (uri NULL = not linkable). */
+#define URI_CACHE_SLOTS 64
+
+typedef struct {
+    char *path;
+    int plen;
+    char *uri;
+} UriCacheEnt;
+
+static UriCacheEnt g_uri_cache[URI_CACHE_SLOTS];
+
 static int build_file_uri_target(char *dst, int dstmax, const char *path, int plen) {
     if (!dst || dstmax < 16 || !path || plen <= 0) return 0;
     if (!allow_remote_file_links()) return 0;
@@ -2355,21 +2711,44 @@ static int build_file_uri_target(char *dst, int dstmax, const char *path, int pl
         return (n > 0 && n < dstmax) ? 1 : 0;
     }
 
-    char abs_path[8192];
-    int alen = expand_path_to_abs(abs_path, sizeof(abs_path), path, plen);
-    if (alen <= 0) return 0;
+    unsigned h = 2166136261u;
+    for (int i = 0; i < plen; i++) h = (h ^ (unsigned char)path[i]) * 16777619u;
+    UriCacheEnt *ce = &g_uri_cache[h % URI_CACHE_SLOTS];
+    if (ce->path && ce->plen == plen && memcmp(ce->path, path, (size_t)plen) == 0) {
+        if (!ce->uri) return 0;
+        int n = snprintf(dst, (size_t)dstmax, "%s", ce->uri);
+        return (n > 0 && n < dstmax) ? 1 : 0;
+    }
 
-    char enc[16384];
-    uri_encode_path(enc, sizeof(enc), abs_path, alen);
-    int n = snprintf(dst, (size_t)dstmax, "file://%s", enc);
-    return (n > 0 && n < dstmax) ? 1 : 0;
+    int ok = build_file_uri_target_encoded(dst, dstmax, path, plen);
+    char *np = xmalloc((size_t)plen + 1);
+    if (!np) return ok;
+    memcpy(np, path, (size_t)plen);
+    np[plen] = '\0';
+    free(ce->path);
+    free(ce->uri);
+    ce->path = np;
+    ce->plen = plen;
+    ce->uri = ok ? xstrdup(dst) : NULL;
+    if (ok && !ce->uri) { free(ce->path); ce->path = NULL; }
+    return ok;
 }
 
+/* RFC 3986 unreserved characters plus '/': copied into file:// URIs as is. */
+static const unsigned char g_uri_unreserved[256] = {
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,  /* 00 */
+    0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,  /* 10 */
+    0,0,0,0,0,0,0,0,0,0,0,0,0,1,1,1,  /* 20 */
+    1,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,  /* 30 */
+    0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 40 */
+    1,1,1,1,1,1,1,1,1,1,1,0,0,0,0,1,  /* 50 */
+    0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,  /* 60 */
+    1,1,1,1,1,1,1,1,1,1,1,0,0,0,1,0,  /* 70 */
+    /* 80..ff: 0 */
+};
+
 static int uri_is_unreserved(unsigned char c) {
-    return (c >= 'a' && c <= 'z') ||
-           (c >= 'A' && c <= 'Z') ||
-           (c >= '0' && c <= '9') ||
-           c == '-' || c == '.' || c == '_' || c == '~' || c == '/';
+    return g_uri_unreserved[c];
 }
 
 static int uri_path_is_safe(const char *path, int plen) {
@@ -2385,7 +2764,14 @@ static void uri_encode_path(char *dst, int dstmax, const char *src, int srclen)
     for (int i = 0; i < srclen && o < dstmax - 1; i++) {
         unsigned char c = (unsigned char)src[i];
         if (uri_is_unreserved(c)) {
-            dst[o++] = (char)c;
+            /* Copy the whole run of safe bytes at once. */
+            int j = i + 1;
+            while (j < srclen && uri_is_unreserved((unsigned char)src[j])) j++;
+            int run = j - i;
+            if (run > dstmax - 1 - o) run = dstmax - 1 - o;
+            memcpy(dst + o, src + i, (size_t)run);
+            o += run;
+            i += run - 1;
         } else if (o < dstmax - 3) {
             static const char hx[] = "0123456789ABCDEF";
             dst[o++] = '%';
@@ -2420,16 +2806,24 @@ static int expand_path_to_abs(char *dst, int dstmax, const char *path, int plen)
 
 static int looks_like_table_row(const char *s) {
     if (!s || !*s) return 0;
-    if (strstr(s, "│") || strstr(s, "┌") || strstr(s, "├") || strstr(s, "└")) return 1;
-    int pipes = 0;
+    /* Called for every markdown line, so classify in one pass: box-drawing
+     * borders (│ ┌ ├ └ all encode as E2 94 xx), pipe count, and " | ". */
+    int pipes = 0, spaced = 0;
     for (const char *p = s; *p; p++) {
-        if (*p == '|') pipes++;
+        unsigned char c = (unsigned char)*p;
+        if (c == '|') {
+            pipes++;
+            if (p > s && p[-1] == ' ' && p[1] == ' ') spaced = 1;
+        } else if (c == 0xE2 && (unsigned char)p[1] == 0x94) {
+            unsigned char t = (unsigned char)p[2];
+            if (t == 0x82 || t == 0x8C || t == 0x9C || t == 0x94) return 1;
+        }
     }
     if (pipes < 2) return 0;
     const char *p = s;
     while (*p == ' ' || *p == '\t') p++;
     if (*p == '|') return 1;
-    return strstr(s, " | ") != NULL;
+    return spaced;
 }
 
 static int looks_like_tool_header_row(const char *s) {
@@ -2535,15 +2929,11 @@ static void linkify(char *dst, int dstmax, const char *src) {
 
     #define LF_CH(ch)  do { if (o < dstmax-1) dst[o++] = (ch); } while(0)
     #define LF_S(s)    do { const char *_s=(s); while(*_s && o<dstmax-1) dst[o++]=*_s++; } while(0)
+    #define LF_N(s, n) do { int _n=(n); if (_n > dstmax-1-o) _n = dstmax-1-o; \
+                            if (_n > 0) { memcpy(dst+o, (s), (size_t)_n); o += _n; } } while(0)
+    #define LF_LIT(s)  LF_N(s, (int)sizeof(s) - 1)
 
     while (*p && o < dstmax - 200) {
-        /* Pass through ANSI CSI sequences */
-        if (p[0]=='\033' && p[1]=='[') {
-            LF_CH(*p++); LF_CH(*p++);
-            while (*p && !isalpha((unsigned char)*p) && *p!='~') LF_CH(*p++);
-            if (*p) LF_CH(*p++);
-            continue;
-        }
         /* Pass through existing OSC-8 sequences */
         if (p[0]=='\033' && p[1]==']' && p[2]=='8' && p[3]==';') {
             const char *payload = p + 4;
@@ -2556,19 +2946,11 @@ static void linkify(char *dst, int dstmax, const char *src) {
             in_osc8_label = is_close ? 0 : 1;
             continue;
         }
-        /* Pass through other OSC sequences */
-        if (p[0]=='\033' && p[1]==']') {
-            while (*p) {
-                if (*p=='\a') { LF_CH(*p++); break; }
-                if (p[0]=='\033' && p[1]=='\\') { LF_CH(*p++); LF_CH(*p++); break; }
-                LF_CH(*p++);
-            }
-            continue;
-        }
-        /* Pass through other ESC sequences */
+        /* Pass through any other escape sequence */
         if (p[0]=='\033') {
-            LF_CH(*p++);
-            if (*p) LF_CH(*p++);
+            int k = ansi_seq_len(p, INT_MAX);
+            LF_N(p, k);
+            p += k;
             continue;
         }
         if (in_osc8_label) {
@@ -2590,15 +2972,13 @@ static void linkify(char *dst, int dstmax, const char *src) {
                     memcpy(label, start, (size_t)n);
                     label[n] = '\0';
                 }
-                LF_S("\033]8;;");
-                for (int i=0; i<ulen; i++) LF_CH(start[i]);
-                LF_CH('\a');
-                LF_S(BO C_URL UL_ON);
+                LF_LIT(OSC8_OPEN);
+                LF_N(start, ulen);
+                LF_LIT(OSC8_URL_MID);
                 LF_S(label);
-                LF_S(UL_OFF "\033[22m");
-                LF_S("\033]8;;\a");
+                LF_LIT(OSC8_CLOSE);
             } else {
-                for (int i=0; i<ulen; i++) LF_CH(start[i]);
+                LF_N(start, ulen);
             }
             continue;
         }
@@ -2643,20 +3023,18 @@ static void linkify(char *dst, int dstmax, const char *src) {
 
                     char uri[16384];
                     if (build_file_uri_target(uri, sizeof(uri), start, fplen)) {
-                        LF_S("\033]8;;");
+                        LF_LIT(OSC8_OPEN);
                         LF_S(uri);
-                        LF_CH('\a');
-                        LF_S(BO C_FLINK UL_ON);
+                        LF_LIT(OSC8_FILE_MID);
                         LF_S(label);
-                        LF_S(UL_OFF "\033[22m");
-                        LF_S("\033]8;;\a");
+                        LF_LIT(OSC8_CLOSE);
                         continue;
                     }
 
                     /* Non-clickable fallback path (remote default or expansion failure). */
-                    for (int i=0; i<fplen; i++) LF_CH(start[i]);
+                    LF_N(start, fplen);
                 } else {
-                    for (int i=0; i<fplen; i++) LF_CH(start[i]);
+                    LF_N(start, fplen);
                 }
                 continue;
             }
@@ -2668,15 +3046,14 @@ static void linkify(char *dst, int dstmax, const char *src) {
 
     #undef LF_CH
     #undef LF_S
+    #undef LF_N
+    #undef LF_LIT
 }
 
 static void L_pushw_link(Lines *l, const char *s) {
     if (!s) { L_pushw(l, ""); return; }
-    if (!strstr(s, "http://") &&
-        !strstr(s, "https://") &&
-        !strstr(s, "~/") &&
-        !strstr(s, "/") &&
-        !strstr(s, "\033]8;;")) {
+    /* Every URL or path linkify() can match contains a '/'. */
+    if (!strchr(s, '/') && !strstr(s, "\033]8;;")) {
         L_pushw(l, s);
         return;
     }
@@ -2717,22 +3094,22 @@ static void link_map_add(int row, int x0, int x1, const char *uri) {
     g_link_map.n++;
 }
 
-static int link_map_track_line(const char *s, int start_row) {
+/* Records link spans for s drawn from start_row; returns rows used and,
+ * if end_col is set, the last column written on the final row -- or 0
+ * when the line has non-ASCII or control text, whose width (combining
+ * marks, ZWJ, VS16...) terminals disagree on. */
+static int link_map_track_line(const char *s, int start_row, int *end_col) {
+    if (end_col) *end_col = 0;
     if (!s || start_row <= 0) return 0;
     int row = start_row;
     int col = 1;
     char active_uri[8192] = "";
     int active = 0;
+    int exact = 1;
     int slen = (int)strlen(s);
 
     for (int i = 0; s[i]; ) {
         unsigned char c = (unsigned char)s[i];
-        if (c == 0x1b && s[i + 1] == '[') {
-            i += 2;
-            while (s[i] && !isalpha((unsigned char)s[i]) && s[i] != '~') i++;
-            if (s[i]) i++;
-            continue;
-        }
         if (c == 0x1b && s[i + 1] == ']' && s[i + 2] == '8' && s[i + 3] == ';') {
             i += 4;
             int sep = 0;
@@ -2754,31 +3131,25 @@ static int link_map_track_line(const char *s, int start_row) {
             active = (active_uri[0] != '\0');
             continue;
         }
-        if (c == 0x1b && s[i + 1] == ']') {
-            i += 2;
-            while (s[i]) {
-                if (s[i] == '\a') { i++; break; }
-                if (s[i] == 0x1b && s[i + 1] == '\\') { i += 2; break; }
-                i++;
-            }
-            continue;
-        }
         if (c == 0x1b) {
-            i += s[i + 1] ? 2 : 1;
+            i += ansi_seq_len(s + i, slen - i);
             continue;
         }
 
-        if (col > g_cols) {
+        if (c < 0x20 || c >= 0x7f) exact = 0;
+        int next = input_next_boundary(s, slen, i);
+        int w = utf8_cells(s + i, next - i);
+        if (col + w - 1 > g_cols) {
             row++;
             col = 1;
         }
 
-        int next = input_next_boundary(s, slen, i);
-        if (active) link_map_add(row, col, col, active_uri);
-        col++;
+        if (active) link_map_add(row, col, col + w - 1, active_uri);
+        col += w;
         i = next;
     }
 
+    if (end_col) *end_col = exact ? col - 1 : 0;
     return row - start_row + 1;
 }
 
@@ -2818,8 +3189,10 @@ static void footer_emit_plain(const char *s, int *used, int max_cells) {
     int slen = (int)strlen(s);
     for (int i = 0; s[i] && *used < max_cells; ) {
         int next = input_next_boundary(s, slen, i);
+        int w = utf8_cells(s + i, next - i);
+        if (*used + w > max_cells) break;
         ob_raw(s + i, next - i);
-        (*used)++;
+        *used += w;
         i = next;
     }
 }
@@ -2855,15 +3228,6 @@ static void emit_line_with_hover(const char *s, int start_row) {
     for (int i = 0; s[i]; ) {
         unsigned char c = (unsigned char)s[i];
 
-        if (c == 0x1b && s[i + 1] == '[') {
-            int j = i + 2;
-            while (s[j] && !isalpha((unsigned char)s[j]) && s[j] != '~') j++;
-            if (s[j]) j++;
-            ob_raw(s + i, j - i);
-            i = j;
-            continue;
-        }
-
         if (c == 0x1b && s[i + 1] == ']' && s[i + 2] == '8' && s[i + 3] == ';') {
             int j = i + 4;
             int sep = 0;
@@ -2899,26 +3263,16 @@ static void emit_line_with_hover(const char *s, int start_row) {
             continue;
         }
 
-        if (c == 0x1b && s[i + 1] == ']') {
-            int j = i + 2;
-            while (s[j]) {
-                if (s[j] == '\a') { j++; break; }
-                if (s[j] == 0x1b && s[j + 1] == '\\') { j += 2; break; }
-                j++;
-            }
-            ob_raw(s + i, j - i);
-            i = j;
-            continue;
-        }
-
         if (c == 0x1b) {
-            int j = i + (s[i + 1] ? 2 : 1);
+            int j = i + ansi_seq_len(s + i, slen - i);
             ob_raw(s + i, j - i);
             i = j;
             continue;
         }
 
-        if (col > g_cols) {
+        int next = input_next_boundary(s, slen, i);
+        int w = utf8_cells(s + i, next - i);
+        if (col + w - 1 > g_cols) {
             if (hover_on) { ob("\033[27m"); hover_on = 0; }
             row++;
             col = 1;
@@ -2930,9 +3284,8 @@ static void emit_line_with_hover(const char *s, int start_row) {
             hover_on = want_hover;
         }
 
-        int next = input_next_boundary(s, slen, i);
         ob_raw(s + i, next - i);
-        col++;
+        col += w;
         i = next;
     }
 
@@ -2941,15 +3294,41 @@ static void emit_line_with_hover(const char *s, int start_row) {
 
 static void open_uri_async(const char *uri) {
     if (!uri || !*uri) return;
-    pid_t pid = fork();
-    if (pid != 0) return;
-    setsid();
 #if defined(__APPLE__)
-    execlp("open", "open", uri, (char *)NULL);
+    char *argv[] = { "open", (char *)uri, NULL };
 #else
-    execlp("xdg-open", "xdg-open", uri, (char *)NULL);
+    char *argv[] = { "xdg-open", (char *)uri, NULL };
 #endif
+#ifdef POSIX_SPAWN_SETSID
+    posix_spawnattr_t attr;
+    posix_spawn_file_actions_t fa;
+    if (posix_spawnattr_init(&attr) != 0) return;
+    if (posix_spawn_file_actions_init(&fa) != 0) {
+        posix_spawnattr_destroy(&attr);
+        return;
+    }
+    posix_spawnattr_setflags(&attr, POSIX_SPAWN_SETSID);
+    posix_spawn_file_actions_addopen(&fa, STDOUT_FILENO, "/dev/null", O_WRONLY, 0);
+    posix_spawn_file_actions_addopen(&fa, STDERR_FILENO, "/dev/null", O_WRONLY, 0);
+    pid_t pid;
+    posix_spawnp(&pid, argv[0], &fa, &attr, argv, environ);
+    posix_spawn_file_actions_destroy(&fa);
+    posix_spawnattr_destroy(&attr);
+#else
+    /* No spawn flag for it: the opener must still leave our session so
+     * it does not get the pager's terminal signals. */
+    pid_t pid = fork();
+    if (pid != 0) return;
+    setsid();
+    int nul = open("/dev/null", O_WRONLY);
+    if (nul >= 0) {
+        dup2(nul, STDOUT_FILENO);
+        dup2(nul, STDERR_FILENO);
+        if (nul > STDERR_FILENO) close(nul);
+    }
+    execvp(argv[0], argv);
     _exit(127);
+#endif
 }
 
 /* ── Transcript items ──────────────────────────────────────────────────── */
@@ -2984,40 +3363,34 @@ static void I_free(Items *it) {
     free(it->d); memset(it, 0, sizeof(*it));
 }
 
-static void skip_st_terminated(const char *s, int len, int *idx, int allow_bel) {
-    int i = idx ? *idx : 0;
-    while (i < len) {
-        if (allow_bel && s[i] == '\a') { i++; break; }
-        if (i + 1 < len && s[i] == '\033' && s[i + 1] == '\\') { i += 2; break; }
-        i++;
+static void I_truncate(Items *it, int n) {
+    while (it->n > n) {
+        it->n--;
+        free(it->d[it->n].text);
+        free(it->d[it->n].label);
     }
-    if (idx) *idx = i;
 }
 
 /* Strip inbound terminal escape/control sequences from transcript payloads. */
 static char *sanitize(const char *s) {
     if (!s) return NULL;
-    int len = (int)strlen(s);
+    /* Most payloads carry no escapes or control bytes; find that out while
+     * measuring the string and copy it whole. */
+    int len = 0, dirty = 0;
+    for (; s[len]; len++) {
+        unsigned char c = (unsigned char)s[len];
+        if ((c < 0x20 && c != '\n' && c != '\t') || c == 0x7f) dirty = 1;
+    }
     char *d = xmalloc((size_t)len + 1);
     if (!d) return NULL;
+    if (!dirty) {
+        memcpy(d, s, (size_t)len + 1);
+        return d;
+    }
     int j = 0;
     for (int i = 0; i < len; ) {
         if (s[i]=='\033') {
-            i++;
-            if (i<len && s[i]=='[') {
-                i++;
-                while (i<len && !isalpha((unsigned char)s[i]) && s[i] != '~') i++;
-                if (i<len) i++;
-            } else if (i<len && s[i]==']') {
-                i++;
-                skip_st_terminated(s, len, &i, 1);
-            } else if (i<len && (s[i]=='P' || s[i]=='X' || s[i]=='^' || s[i]=='_')) {
-                /* DCS, SOS, PM, APC (ST-terminated strings) */
-                i++;
-                skip_st_terminated(s, len, &i, 0);
-            } else if (i<len) {
-                i++;
-            }
+            i += ansi_seq_len(s + i, len - i);
         } else {
             unsigned char c = (unsigned char)s[i++];
             if ((c < 0x20 && c != '\n' && c != '\t') || c == 0x7f) continue;
@@ -3033,20 +3406,7 @@ static int sanitize_copy(char *dst, int dstmax, const char *s, int slen) {
     int i = 0, j = 0;
     while (i < slen && j < dstmax - 1) {
         if (s[i] == '\033') {
-            i++;
-            if (i < slen && s[i] == '[') {
-                i++;
-                while (i < slen && !isalpha((unsigned char)s[i]) && s[i] != '~') i++;
-                if (i < slen) i++;
-            } else if (i < slen && s[i] == ']') {
-                i++;
-                skip_st_terminated(s, slen, &i, 1);
-            } else if (i < slen && (s[i] == 'P' || s[i] == 'X' || s[i] == '^' || s[i] == '_')) {
-                i++;
-                skip_st_terminated(s, slen, &i, 0);
-            } else if (i < slen) {
-                i++;
-            }
+            i += ansi_seq_len(s + i, slen - i);
         } else {
             unsigned char c = (unsigned char)s[i++];
             if ((c < 0x20 && c != '\n' && c != '\t') || c == 0x7f) continue;
@@ -3082,13 +3442,54 @@ static const char *sanitize_line_view(const char *src, int slen, char *buf, int
 }
 
 static int is_systag(const char *s) {
-    return strstr(s,"<local-command-caveat") || strstr(s,"<command-name") ||
-           strstr(s,"<system-reminder") || strstr(s,"<user-prompt-submit-hook");
+    for (const char *p = strchr(s, '<'); p; p = strchr(p + 1, '<')) {
+        if (strncmp(p + 1, "local-command-caveat", 20) == 0 ||
+            strncmp(p + 1, "command-name", 12) == 0 ||
+            strncmp(p + 1, "system-reminder", 15) == 0 ||
+            strncmp(p + 1, "user-prompt-submit-hook", 23) == 0) return 1;
+    }
+    return 0;
 }
 
 static const char *lbl_keys[] = {
     "command","file_path","path","pattern","query","url","content","description",NULL
 };
+#define LBL_NKEYS ((int)(sizeof(lbl_keys) / sizeof(lbl_keys[0])) - 1)
+
+/* One walk over a tool input object: returns the string value whose key
+ * ranks best in lbl_keys (or NULL); *first gets the first key's value. */
+static const char *tool_label_value(const char *inp, const char **first) {
+    const char *p = jws(inp);
+    if (*p == '{') p++;
+    const char *best = NULL;
+    int best_rank = LBL_NKEYS;
+    *first = NULL;
+    while (*p && *p != '}') {
+        p = jws(p);
+        if (*p != '"') break;
+        const char *ks = p + 1;
+        p = jskip_s(p);
+        size_t kn = (size_t)(p - ks - 1);
+        p = jws(p);
+        if (*p == ':') p = jws(p + 1);
+        if (!*first) *first = p;
+        if (*p == '"') {
+            for (int k = 0; k < best_rank; k++) {
+                if (lbl_keys[k][0] == ks[0] && strlen(lbl_keys[k]) == kn &&
+                    strncmp(ks, lbl_keys[k], kn) == 0) {
+                    best = p;
+                    best_rank = k;
+                    break;
+                }
+            }
+            if (best_rank == 0) break;
+        }
+        p = jskip(p);
+        p = jws(p);
+        if (*p == ',') p++;
+    }
+    return best;
+}
 
 /* Extract trimmed, sanitized string from JSON value at p */
 static char *extract_text(const char *p, int bufmax, int sanitize_out) {
@@ -3302,8 +3703,8 @@ static void extract_tool_use_result_meta(const char *tool_use_result,
     }
 }
 
-static void relabel_last_tool_use(Items *items, const char *op_name, const char *file_path) {
-    if (!items || items->n <= 0 || !op_name || !*op_name) return;
+static int relabel_last_tool_use(Items *items, const char *op_name, const char *file_path) {
+    if (!items || items->n <= 0 || !op_name || !*op_name) return -1;
     for (int i = items->n - 1; i >= 0; i--) {
         Item *it = &items->d[i];
         if (it->type != IT_TU) continue;
@@ -3321,174 +3722,271 @@ static void relabel_last_tool_use(Items *items, const char *op_name, const char
                 free(it->label);
                 it->label = xstrdup("");
             }
+            return i;
         }
         break;
     }
+    return -1;
 }
 
 /* ── Transcript parser ─────────────────────────────────────────────────── */
 
-static void parse_transcript(const char *path, Items *items,
-                             int *out_tok, double *out_pct, int ctx_lim) {
-    FILE *f = fopen(path, "r");
-    if (!f) return;
-
-    char *line = NULL; size_t lsz = 0; ssize_t len;
-    int li = 0, lcc = 0, lcr = 0;
-
-    while ((len = getline(&line, &lsz, f)) != -1) {
-        while (len>0 && (line[len-1]=='\n'||line[len-1]=='\r')) line[--len]='\0';
-        if (len == 0) continue;
-
-        const char *tv = jfind(line, "type");
-        const char *msg = jfind(line, "message");
-        if (!tv || !msg) continue;
-        const char *ct = jfind(msg, "content");
-
-        if (jstreq(tv, "assistant")) {
-            const char *usg = jfind(msg, "usage");
-            if (usg) {
-                const char *v;
-                if ((v = jfind(usg, "input_tokens"))) li = jint(v);
-                if ((v = jfind(usg, "cache_creation_input_tokens"))) lcc = jint(v);
-                if ((v = jfind(usg, "cache_read_input_tokens"))) lcr = jint(v);
-            }
-            if (!ct || *jws(ct) != '[') continue;
-            const char *el = jws(ct);
-            if (*el=='[') el = jws(el+1);
-            while (el && *el && *el!=']') {
-                if (*el=='{') {
-                    const char *bt = jfind(el, "type");
-                    if (jstreq(bt, "text")) {
-                        char *t = extract_text(jfind(el, "text"), (int)len+1, g_perf_compat ? 1 : 0);
-                        if (t) I_push(items, IT_AST, t, NULL, 0);
-                    } else if (jstreq(bt, "tool_use")) {
-                        char nm[128] = "?";
-                        char nm_disp[1536] = "";
-                        const char *nv = jfind(el, "name");
-                        if (nv) jstr(nv, nm, sizeof(nm));
-                        snprintf(nm_disp, sizeof(nm_disp), "%s", nm);
-                        char lbl[256] = "";
-                        const char *inp = jfind(el, "input");
-                        if (inp) {
-                            for (int k=0; lbl_keys[k]; k++) {
-                                const char *lv = jfind(inp, lbl_keys[k]);
-                                if (lv && *lv=='"') { jstr(lv, lbl, sizeof(lbl)); break; }
-                            }
-                            if (!lbl[0]) {
-                                const char *p2 = jws(inp);
-                                if (*p2=='{') p2++;
-                                p2 = jws(p2);
-                                if (*p2=='"') { p2=jskip_s(p2); p2=jws(p2); if(*p2==':') p2=jws(p2+1); if(*p2=='"') jstr(p2,lbl,sizeof(lbl)); }
-                            }
+/* Parsed transcript plus where parsing stopped.  The transcript is an
+ * append-only JSONL file, so a reload only needs the bytes past `off`;
+ * anything else (new inode, truncation, in-place rewrite) starts over. */
+typedef struct {
+    Items items;
+    dev_t dev;
+    ino_t ino;
+    off_t size;
+    off_t off;          /* end of the last newline-terminated line parsed */
+    int has_tail;       /* an unterminated final line was parsed */
+    int tail_items;     /* ...and produced this many items */
+    int li, lcc, lcr;   /* usage from the last assistant message */
+    int tail_li, tail_lcc, tail_lcr;
+    int dirty_from;     /* first item added or changed since last render */
+    char seam[32];      /* the bytes just before `off`, to spot a rewrite */
+    int seam_len;
+    int valid;
+} Transcript;
+
+static void transcript_reset(Transcript *tr) {
+    I_free(&tr->items);
+    memset(tr, 0, sizeof(*tr));
+}
+
+static void parse_transcript_line(Transcript *tr, char *line, ssize_t len) {
+    Items *items = &tr->items;
+    while (len>0 && (line[len-1]=='\n'||line[len-1]=='\r')) line[--len]='\0';
+    if (len == 0) return;
+
+    const char *tv = jfind(line, "type");
+    const char *msg = jfind(line, "message");
+    if (!tv || !msg) return;
+    const char *ct = jfind(msg, "content");
+
+    if (jstreq(tv, "assistant")) {
+        const char *usg = jfind(msg, "usage");
+        if (usg) {
+            const char *v;
+            if ((v = jfind(usg, "input_tokens"))) tr->li = jint(v);
+            if ((v = jfind(usg, "cache_creation_input_tokens"))) tr->lcc = jint(v);
+            if ((v = jfind(usg, "cache_read_input_tokens"))) tr->lcr = jint(v);
+        }
+        if (!ct || *jws(ct) != '[') return;
+        const char *el = jws(ct);
+        if (*el=='[') el = jws(el+1);
+        while (el && *el && *el!=']') {
+            if (*el=='{') {
+                const char *bt = jfind(el, "type");
+                if (jstreq(bt, "text")) {
+                    char *t = extract_text(jfind(el, "text"), (int)len+1, g_perf_compat ? 1 : 0);
+                    if (t) I_push(items, IT_AST, t, NULL, 0);
+                } else if (jstreq(bt, "tool_use")) {
+                    char nm[128] = "?";
+                    char nm_disp[1536] = "";
+                    const char *nv = jfind(el, "name");
+                    if (nv) jstr(nv, nm, sizeof(nm));
+                    snprintf(nm_disp, sizeof(nm_disp), "%s", nm);
+                    char lbl[256] = "";
+                    const char *inp = jfind(el, "input");
+                    if (inp) {
+                        const char *fv = NULL;
+                        const char *lv = tool_label_value(inp, &fv);
+                        if (lv) jstr(lv, lbl, sizeof(lbl));
+                        if (!lbl[0] && fv && *fv=='"') jstr(fv, lbl, sizeof(lbl));
+                    }
+                    if (strcasecmp(nm, "Read") == 0 && inp) {
+                        int lim = jint(jfind(inp, "limit"));
+                        if (lim > 0) {
+                            snprintf(nm_disp, sizeof(nm_disp), "Read %d lines", lim);
+                            lbl[0] = '\0';
                         }
-                        if (strcasecmp(nm, "Read") == 0 && inp) {
-                            int lim = jint(jfind(inp, "limit"));
-                            if (lim > 0) {
-                                snprintf(nm_disp, sizeof(nm_disp), "Read %d lines", lim);
-                                lbl[0] = '\0';
-                            }
-                        } else if ((strcasecmp(nm, "Edit") == 0 || strcasecmp(nm, "MultiEdit") == 0) && inp) {
-                            char fpb[1200] = "";
-                            const char *fpv = jfind(inp, "file_path");
+                    } else if ((strcasecmp(nm, "Edit") == 0 || strcasecmp(nm, "MultiEdit") == 0) && inp) {
+                        char fpb[1200] = "";
+                        const char *fpv = jfind(inp, "file_path");
+                        if (fpv && *fpv == '"') jstr(fpv, fpb, sizeof(fpb));
+                        if (!fpb[0]) {
+                            fpv = jfind(inp, "path");
                             if (fpv && *fpv == '"') jstr(fpv, fpb, sizeof(fpb));
-                            if (!fpb[0]) {
-                                fpv = jfind(inp, "path");
-                                if (fpv && *fpv == '"') jstr(fpv, fpb, sizeof(fpb));
-                            }
-                            if (fpb[0]) {
-                                snprintf(nm_disp, sizeof(nm_disp), "Update(%s)", fpb);
-                                lbl[0] = '\0';
-                            } else {
-                                snprintf(nm_disp, sizeof(nm_disp), "Update");
-                            }
                         }
-                        if (strlen(lbl)>72) { lbl[69]='.'; lbl[70]='.'; lbl[71]='.'; lbl[72]='\0'; }
-                        I_push(items, IT_TU, sanitize(nm_disp), sanitize(lbl), 0);
+                        if (fpb[0]) {
+                            snprintf(nm_disp, sizeof(nm_disp), "Update(%s)", fpb);
+                            lbl[0] = '\0';
+                        } else {
+                            snprintf(nm_disp, sizeof(nm_disp), "Update");
+                        }
                     }
+                    if (strlen(lbl)>72) { lbl[69]='.'; lbl[70]='.'; lbl[71]='.'; lbl[72]='\0'; }
+                    I_push(items, IT_TU, sanitize(nm_disp), sanitize(lbl), 0);
                 }
-                el = jskip(el); el = jws(el); if (*el==',') el=jws(el+1);
             }
-        } else if (jstreq(tv, "user")) {
-            if (ct && *jws(ct)=='"') {
-                char *t = extract_text(ct, (int)len+1, g_perf_compat ? 1 : 0);
-                if (t && !is_systag(t)) I_push(items, IT_HUM, t, NULL, 0);
-                else free(t);
-            } else if (ct && *jws(ct)=='[') {
-                const char *tur = jfind(line, "toolUseResult");
-                int sp_add = 0, sp_del = 0;
-                int sp_used = 0;
-                char *sp_payload = build_structured_patch_payload(tur, &sp_add, &sp_del);
-                char tur_kind[64] = "";
-                char tur_path[1200] = "";
-                extract_tool_use_result_meta(tur, tur_kind, sizeof(tur_kind), tur_path, sizeof(tur_path));
-                if (sp_payload) {
-                    if (strcasecmp(tur_kind, "create") == 0) {
-                        relabel_last_tool_use(items, "Create", tur_path);
-                    } else if (strcasecmp(tur_kind, "update") == 0 || strcasecmp(tur_kind, "edit") == 0) {
-                        relabel_last_tool_use(items, "Update", tur_path);
-                    } else if (tur_path[0]) {
-                        relabel_last_tool_use(items, "Update", tur_path);
-                    }
+            el = jskip(el); el = jws(el); if (*el==',') el=jws(el+1);
+        }
+    } else if (jstreq(tv, "user")) {
+        if (ct && *jws(ct)=='"') {
+            char *t = extract_text(ct, (int)len+1, g_perf_compat ? 1 : 0);
+            if (t && !is_systag(t)) I_push(items, IT_HUM, t, NULL, 0);
+            else free(t);
+        } else if (ct && *jws(ct)=='[') {
+            const char *tur = jfind(line, "toolUseResult");
+            int sp_add = 0, sp_del = 0;
+            int sp_used = 0;
+            char *sp_payload = build_structured_patch_payload(tur, &sp_add, &sp_del);
+            char tur_kind[64] = "";
+            char tur_path[1200] = "";
+            extract_tool_use_result_meta(tur, tur_kind, sizeof(tur_kind), tur_path, sizeof(tur_path));
+            if (sp_payload) {
+                int ri = -1;
+                if (strcasecmp(tur_kind, "create") == 0) {
+                    ri = relabel_last_tool_use(items, "Create", tur_path);
+                } else if (strcasecmp(tur_kind, "update") == 0 || strcasecmp(tur_kind, "edit") == 0) {
+                    ri = relabel_last_tool_use(items, "Update", tur_path);
+                } else if (tur_path[0]) {
+                    ri = relabel_last_tool_use(items, "Update", tur_path);
                 }
-                const char *el = jws(ct);
-                if (*el=='[') el=jws(el+1);
-                while (el && *el && *el!=']') {
-                    if (*el=='{') {
-                        const char *bt = jfind(el, "type");
-                        if (jstreq(bt, "tool_result")) {
-                            const char *rc = jfind(el, "content");
-                            char *text = NULL;
-                            int ie = 0;
-                            int handled_struct_patch = 0;
-                            const char *ev = jfind(el, "is_error");
-                            if (ev && (*ev=='t'||*ev=='T')) ie=1;
-                            if (!ie && sp_payload && !sp_used) {
-                                char sbuf[128];
-                                snprintf(sbuf, sizeof(sbuf), "Added %d lines, removed %d lines", sp_add, sp_del);
-                                I_push(items, IT_TR, sanitize(sbuf), NULL, 0);
-                                I_push(items, IT_TR, sp_payload, NULL, 0);
-                                sp_payload = NULL;
-                                sp_used = 1;
-                                handled_struct_patch = 1;
-                            }
-                            if (!handled_struct_patch && rc && *jws(rc)=='"') {
-                                text = extract_text(rc, (int)len+1, g_perf_compat ? 1 : 0);
-                            } else if (!handled_struct_patch && rc && *jws(rc)=='[') {
-                                int bmax = (int)len+1;
-                                char *buf = xmalloc((size_t)bmax); int bi=0;
-                                if (!buf) break;
-                                const char *sub = jws(rc);
-                                if (*sub=='[') sub=jws(sub+1);
-                                while (sub && *sub && *sub!=']') {
-                                    if (*sub=='{' && jstreq(jfind(sub,"type"),"text")) {
-                                        const char *sv = jfind(sub,"text");
-                                        if (sv && *sv=='"') {
-                                            if (bi>0 && bi<bmax-1) buf[bi++]='\n';
-                                            bi += jstr(sv, buf+bi, bmax-bi);
-                                        }
+                if (ri >= 0 && ri < tr->dirty_from) tr->dirty_from = ri;
+            }
+            const char *el = jws(ct);
+            if (*el=='[') el=jws(el+1);
+            while (el && *el && *el!=']') {
+                if (*el=='{') {
+                    const char *bt = jfind(el, "type");
+                    if (jstreq(bt, "tool_result")) {
+                        const char *rc = jfind(el, "content");
+                        char *text = NULL;
+                        int ie = 0;
+                        int handled_struct_patch = 0;
+                        const char *ev = jfind(el, "is_error");
+                        if (ev && (*ev=='t'||*ev=='T')) ie=1;
+                        if (!ie && sp_payload && !sp_used) {
+                            char sbuf[128];
+                            snprintf(sbuf, sizeof(sbuf), "Added %d lines, removed %d lines", sp_add, sp_del);
+                            I_push(items, IT_TR, sanitize(sbuf), NULL, 0);
+                            I_push(items, IT_TR, sp_payload, NULL, 0);
+                            sp_payload = NULL;
+                            sp_used = 1;
+                            handled_struct_patch = 1;
+                        }
+                        if (!handled_struct_patch && rc && *jws(rc)=='"') {
+                            text = extract_text(rc, (int)len+1, g_perf_compat ? 1 : 0);
+                        } else if (!handled_struct_patch && rc && *jws(rc)=='[') {
+                            int bmax = (int)len+1;
+                            char *buf = xmalloc((size_t)bmax); int bi=0;
+                            if (!buf) break;
+                            const char *sub = jws(rc);
+                            if (*sub=='[') sub=jws(sub+1);
+                            while (sub && *sub && *sub!=']') {
+                                if (*sub=='{' && jstreq(jfind(sub,"type"),"text")) {
+                                    const char *sv = jfind(sub,"text");
+                                    if (sv && *sv=='"') {
+                                        if (bi>0 && bi<bmax-1) buf[bi++]='\n';
+                                        bi += jstr(sv, buf+bi, bmax-bi);
                                     }
-                                    sub=jskip(sub); sub=jws(sub); if(*sub==',') sub=jws(sub+1);
                                 }
-                                buf[bi]='\0';
-                                char *s=buf; while(*s==' '||*s=='\n') s++;
-                                char *e=s+strlen(s); while(e>s&&(e[-1]==' '||e[-1]=='\n')) e--; *e='\0';
-                                if (*s) { text = g_perf_compat ? sanitize(s) : xstrdup(s); }
-                                free(buf);
-                            }
-                            if (text) {
-                                I_push(items, IT_TR, text, NULL, ie);
+                                sub=jskip(sub); sub=jws(sub); if(*sub==',') sub=jws(sub+1);
                             }
+                            buf[bi]='\0';
+                            char *s=buf; while(*s==' '||*s=='\n') s++;
+                            char *e=s+strlen(s); while(e>s&&(e[-1]==' '||e[-1]=='\n')) e--; *e='\0';
+                            if (*s) { text = g_perf_compat ? sanitize(s) : xstrdup(s); }
+                            free(buf);
+                        }
+                        if (text) {
+                            I_push(items, IT_TR, text, NULL, ie);
                         }
                     }
-                    el=jskip(el); el=jws(el); if(*el==',') el=jws(el+1);
                 }
-                if (sp_payload) free(sp_payload);
+                el=jskip(el); el=jws(el); if(*el==',') el=jws(el+1);
             }
+            if (sp_payload) free(sp_payload);
         }
     }
-    free(line); fclose(f);
-    int tot = li + lcc + lcr;
+}
+
+/* Bring `tr` up to date with the file at `path`.  Returns 1 if the items
+ * were rebuilt from scratch, 0 if new items (if any) were appended. */
+static int parse_transcript(Transcript *tr, const char *path) {
+    struct stat sb;
+    if (stat(path, &sb) != 0) return 0;
+
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) return 0;
+
+    /* Only called once the stamp changed, so an unchanged size means the
+     * file was rewritten in place.  A rewrite to a larger size is caught
+     * by the bytes before `off` no longer matching. */
+    int full = !tr->valid || tr->dev != sb.st_dev || tr->ino != sb.st_ino ||
+               sb.st_size < tr->off || sb.st_size == tr->size;
+    if (!full && tr->seam_len > 0) {
+        char chk[sizeof(tr->seam)];
+        full = pread(fd, chk, (size_t)tr->seam_len, tr->off - tr->seam_len) != tr->seam_len ||
+               memcmp(chk, tr->seam, (size_t)tr->seam_len) != 0;
+    }
+    if (full) {
+        transcript_reset(tr);
+    } else if (tr->has_tail) {
+        /* The unterminated line seen last time is re-read from `off`. */
+        I_truncate(&tr->items, tr->items.n - tr->tail_items);
+        if (tr->dirty_from > tr->items.n) tr->dirty_from = tr->items.n;
+        tr->li = tr->tail_li; tr->lcc = tr->tail_lcc; tr->lcr = tr->tail_lcr;
+    }
+    tr->has_tail = 0;
+    tr->tail_items = 0;
+    tr->dev = sb.st_dev;
+    tr->ino = sb.st_ino;
+    tr->size = sb.st_size;
+    tr->valid = 1;
+
+    if (tr->off > 0 && lseek(fd, tr->off, SEEK_SET) != tr->off) {
+        close(fd);
+        transcript_reset(tr);
+        return 1;
+    }
+
+    /* Large read()s split on '\n' in place; the buffer only grows when a
+     * single line outgrows it. */
+    size_t cap = 1 << 16, have = 0;
+    char *buf = xmalloc(cap);
+    if (!buf) { close(fd); return full; }
+    for (;;) {
+        if (have + 1 >= cap) {
+            char *nb = xrealloc(buf, cap * 2);
+            if (!nb) break;
+            buf = nb; cap *= 2;
+        }
+        ssize_t r = read(fd, buf + have, cap - have - 1);
+        if (r < 0 && errno == EINTR) continue;
+        if (r <= 0) break;
+        have += (size_t)r;
+        char *p = buf, *end = buf + have, *nl;
+        while ((nl = memchr(p, '\n', (size_t)(end - p)))) {
+            ssize_t len = nl - p + 1;
+            tr->off += len;
+            parse_transcript_line(tr, p, len);
+            p = nl + 1;
+        }
+        have = (size_t)(end - p);
+        if (have > 0 && p != buf) memmove(buf, p, have);
+    }
+    if (have > 0) {
+        /* Possibly still being written: show it, but parse it again
+         * next time instead of advancing past it. */
+        buf[have] = '\0';
+        int n0 = tr->items.n;
+        tr->has_tail = 1;
+        tr->tail_li = tr->li; tr->tail_lcc = tr->lcc; tr->tail_lcr = tr->lcr;
+        parse_transcript_line(tr, buf, (ssize_t)have);
+        tr->tail_items = tr->items.n - n0;
+    }
+    int sl = tr->off < (off_t)sizeof(tr->seam) ? (int)tr->off : (int)sizeof(tr->seam);
+    tr->seam_len = pread(fd, tr->seam, (size_t)sl, tr->off - sl) == sl ? sl : 0;
+    free(buf); close(fd);
+    return full;
+}
+
+static void transcript_usage(const Transcript *tr, int *out_tok, double *out_pct, int ctx_lim) {
+    int tot = tr->li + tr->lcc + tr->lcr;
     if (tot > 0) { *out_tok = tot; *out_pct = (double)tot / ctx_lim * 100.0; }
 }
 
@@ -3762,7 +4260,7 @@ static void md_render_table_block(Lines *L,
             if (pad < 0) pad = 0;
             o += snprintf(line + o, sizeof(line) - o, C_AST " ");
             if (md_cell_target(src, target, sizeof(target))) {
-                o += snprintf(line + o, sizeof(line) - o, "\033]8;;%s\a%s\033]8;;\a", target, cell);
+                o += snprintf(line + o, sizeof(line) - o, OSC8_OPEN "%s\a%s" OSC8_END, target, cell);
             } else {
                 o += snprintf(line + o, sizeof(line) - o, "%s", cell);
             }
@@ -3887,22 +4385,22 @@ static void render_md(Lines *L, const char *text, int keep_tail_lines) {
         /* Bullets */
         int ind = 0; while(line[ind]==' ') ind++;
         if ((line[ind]=='-'||line[ind]=='*') && line[ind+1]==' ') {
-            fmt_inline(fb, sizeof(fb), line+ind+2);
-            char ob2[16384];
-            snprintf(ob2, sizeof(ob2), "%*s" C_AST BUL " %s" RS, ind, "", fb);
-            L_pushw_link(L, ob2); continue;
+            /* Format the item text straight after its marker; no second
+             * staging buffer. */
+            int fl = snprintf(fb, sizeof(fb), "%*s" C_AST BUL " ", ind, "");
+            fmt_inline(fb+fl, (int)sizeof(fb)-fl-(int)sizeof(RS), line+ind+2);
+            strcat(fb+fl, RS);
+            L_pushw_link(L, fb); continue;
         }
 
         /* Numbered lists */
         if (isdigit((unsigned char)line[0])) {
             const char *d = line; while(isdigit((unsigned char)*d)) d++;
             if (d[0]=='.' && d[1]==' ') {
-                int nl = (int)(d-line); char num[16];
-                memcpy(num,line,nl); num[nl]='\0';
-                fmt_inline(fb, sizeof(fb), d+2);
-                char ob2[16384];
-                snprintf(ob2, sizeof(ob2), C_AST "%s. %s" RS, num, fb);
-                L_pushw_link(L, ob2); continue;
+                int fl = snprintf(fb, sizeof(fb), C_AST "%.*s. ", (int)(d-line), line);
+                fmt_inline(fb+fl, (int)sizeof(fb)-fl-(int)sizeof(RS), d+2);
+                strcat(fb+fl, RS);
+                L_pushw_link(L, fb); continue;
             }
         }
 
@@ -3941,7 +4439,10 @@ static int is_diff_meta_line(const char *view) {
            strncmp(view, "\\ No newline at end of file", 27) == 0;
 }
 
-static int is_structured_diff_text(const char *t) {
+/* Also counts lines into *out_lines (if non-NULL) so callers that need
+ * both don't walk the text twice. */
+static int is_structured_diff_text(const char *t, int *out_lines) {
+    int lines = 1;
     int has_add = 0, has_del = 0, has_ctx = 0;
     int has_valid_hunk = 0, has_invalid_hunk = 0;
     int has_diff_git_valid = 0;
@@ -3960,35 +4461,39 @@ static int is_structured_diff_text(const char *t) {
         else if (ln[0] == '-' && strncmp(ln, "---", 3) != 0) has_del = 1;
         else if (ln[0] == ' ') has_ctx = 1;
 
-        if (strncmp(ln, "diff --git ", 11) == 0) {
-            const char *q = ln + 11;
-            while (*q == ' ' || *q == '\t') q++;
-            if (strncmp(q, "a/", 2) == 0) {
-                const char *sp = q;
-                while (*sp && *sp != ' ' && *sp != '\t') sp++;
-                while (*sp == ' ' || *sp == '\t') sp++;
-                if (strncmp(sp, "b/", 2) == 0) has_diff_git_valid = 1;
+        /* file/meta headers all start with a letter or +++ / --- */
+        if (isalpha((unsigned char)ln[0]) || ln[0] == '+' || ln[0] == '-') {
+            if (strncmp(ln, "diff --git ", 11) == 0) {
+                const char *q = ln + 11;
+                while (*q == ' ' || *q == '\t') q++;
+                if (strncmp(q, "a/", 2) == 0) {
+                    const char *sp = q;
+                    while (*sp && *sp != ' ' && *sp != '\t') sp++;
+                    while (*sp == ' ' || *sp == '\t') sp++;
+                    if (strncmp(sp, "b/", 2) == 0) has_diff_git_valid = 1;
+                }
+            }
+            if (strncmp(ln, "--- ", 4) == 0) has_old = 1;
+            if (strncmp(ln, "+++ ", 4) == 0) has_new = 1;
+            if (strncmp(ln, "Binary files ", 13) == 0 || strncmp(ln, "GIT binary patch", 16) == 0) {
+                has_binary = 1;
+            }
+            if (strncmp(ln, "index ", 6) == 0 ||
+                strncmp(ln, "old mode ", 9) == 0 ||
+                strncmp(ln, "new mode ", 9) == 0 ||
+                strncmp(ln, "new file mode ", 14) == 0 ||
+                strncmp(ln, "deleted file mode ", 18) == 0 ||
+                strncmp(ln, "rename from ", 12) == 0 ||
+                strncmp(ln, "rename to ", 10) == 0 ||
+                strncmp(ln, "similarity index ", 17) == 0) {
+                has_meta_detail = 1;
             }
-        }
-        if (strncmp(ln, "--- ", 4) == 0) has_old = 1;
-        if (strncmp(ln, "+++ ", 4) == 0) has_new = 1;
-        if (strncmp(ln, "Binary files ", 13) == 0 || strncmp(ln, "GIT binary patch", 16) == 0) {
-            has_binary = 1;
-        }
-        if (strncmp(ln, "index ", 6) == 0 ||
-            strncmp(ln, "old mode ", 9) == 0 ||
-            strncmp(ln, "new mode ", 9) == 0 ||
-            strncmp(ln, "new file mode ", 14) == 0 ||
-            strncmp(ln, "deleted file mode ", 18) == 0 ||
-            strncmp(ln, "rename from ", 12) == 0 ||
-            strncmp(ln, "rename to ", 10) == 0 ||
-            strncmp(ln, "similarity index ", 17) == 0) {
-            has_meta_detail = 1;
         }
 
         while (*p && *p != '\n') p++;
-        if (*p == '\n') p++;
+        if (*p == '\n') { p++; lines++; }
     }
+    if (out_lines) *out_lines = lines;
 
     int has_file_headers = has_old && has_new;
     if (has_invalid_hunk) return 0;
@@ -4015,15 +4520,7 @@ static void analyze_tool_result(const char *t, int preview_limit,
         return;
     }
     if (preview_limit < 1) preview_limit = 1;
-    const char *p = t;
-    while (*p) {
-        while (*p && *p != '\n') p++;
-        if (*p == '\n') {
-            lines++;
-            p++;
-        }
-    }
-    is_diff = is_structured_diff_text(t);
+    is_diff = is_structured_diff_text(t, &lines);
     int show = lines > preview_limit ? preview_limit : lines;
     int omitted = lines > show ? lines - show : 0;
     if (out_preview_lines) *out_preview_lines = show;
@@ -4825,8 +5322,44 @@ static void render_structured_patch_block(Lines *L, const char *text, const char
     }
 }
 
-static void render_items(Lines *L, Items *items) {
-    int prev_tu = 0;
+/* Absolute line (dropped_total + n) at which each rendered item starts,
+ * so a reload can cut L back to the first changed item instead of
+ * rendering everything again. */
+typedef struct {
+    int *d;
+    int n, cap;
+    int end;    /* absolute line just past the last rendered item */
+    int cols;   /* width the lines were wrapped for */
+} ItemLines;
+
+static void IL_free(ItemLines *il) {
+    free(il->d);
+    memset(il, 0, sizeof(*il));
+}
+
+/* Cut L back to where item `from` started.  Returns 0 if that is not
+ * possible (width changed, or the lines were already capped away), in
+ * which case the caller rebuilds from scratch. */
+static int render_rewind(Lines *L, ItemLines *il, int from, int has_banner) {
+    if (from <= 0 || from > il->n || il->cols != g_cols) return 0;
+    if (has_banner) L_unprepend(L);
+    int keep = (from < il->n ? il->d[from] : il->end) - L->dropped_total;
+    if (keep < 0 || keep > L->n) return 0;
+    L_truncate(L, keep);
+    il->n = from;
+    return 1;
+}
+
+static void render_items(Lines *L, Items *items, int from, ItemLines *il) {
+    if (il->cap < items->n) {
+        int ncap = il->cap ? il->cap : 64;
+        while (ncap < items->n) ncap *= 2;
+        int *nd = xrealloc(il->d, sizeof(int) * (size_t)ncap);
+        if (!nd) return;
+        il->d = nd;
+        il->cap = ncap;
+    }
+    int prev_tu = from > 0 && items->d[from - 1].type == IT_TU;
     char b[16384];
     static int max_tool_lines = -1;
     static int max_diff_lines = -1;
@@ -4843,8 +5376,9 @@ static void render_items(Lines *L, Items *items) {
         show_tool_rail = env_enabled("CLAUDE_PAGER_TOOL_RAIL") ? 1 : 0;
     }
 
-    for (int i = 0; i < items->n; i++) {
+    for (int i = from; i < items->n; i++) {
         Item *it = &items->d[i];
+        il->d[i] = L->dropped_total + L->n;
 
         switch (it->type) {
         case IT_HUM: {
@@ -4920,6 +5454,9 @@ static void render_items(Lines *L, Items *items) {
             } else {
                 const char *p = it->text;
                 char sb[16384];
+                /* conn+col is the same for every line; build it once */
+                int pl = snprintf(b, sizeof(b), "%s%s", conn, col);
+                int room = (int)sizeof(b) - pl - (int)sizeof(RS);
                 for (int ln=0; ln<show; ln++) {
                     const char *eol = strchr(p, '\n');
                     int ll = eol ? (int)(eol-p) : (int)strlen(p);
@@ -4927,7 +5464,9 @@ static void render_items(Lines *L, Items *items) {
                     if (raw_ll >= (int)sizeof(sb)) raw_ll = (int)sizeof(sb) - 1;
                     int view_len = 0;
                     const char *view = sanitize_line_view(p, raw_ll, sb, sizeof(sb), &view_len);
-                    snprintf(b, sizeof(b), "%s%s%.*s" RS, conn, col, view_len, view);
+                    if (view_len > room) view_len = room;
+                    memcpy(b + pl, view, (size_t)view_len);
+                    memcpy(b + pl + view_len, RS, sizeof(RS));
                     L_pushw_link(L, b);
                     if (!eol) break;
                     p = eol+1;
@@ -4942,12 +5481,56 @@ static void render_items(Lines *L, Items *items) {
         }
         prev_tu = (it->type == IT_TU);
     }
+    il->n = items->n;
+    il->end = L->dropped_total + L->n;
+    il->cols = g_cols;
+}
+
+/* Bring L up to date with items, re-rendering from item `from` when the
+ * earlier lines can be kept, then add the end marker, apply the line cap
+ * and prepend the capped banner.  Returns the item rendering began at. */
+static int render_transcript(Lines *L, Items *items, int from, ItemLines *il, int had_banner) {
+    if (!render_rewind(L, il, from, had_banner)) {
+        from = 0;
+        L_free(L);
+        il->n = 0;
+    }
+    render_items(L, items, from, il);
+    L_push(L, C_HDM "  " EMD " end of transcript " EMD RS);
+    L_push(L, ""); L_push(L, "");
+    if (L->max_keep > 0 && L->n > L->max_keep) {
+        L_drop_head(L, L->n - L->max_keep);
+    }
+    if (L->dropped_total > 0) {
+        char db[128];
+        snprintf(db, sizeof(db), "  " C_HDM ELL " (+%d older lines capped)" RS, L->dropped_total);
+        L_prepend(L, db);
+    }
+    return from;
 }
 
 /* ── Drawing ───────────────────────────────────────────────────────────── */
 
+/* Full-width rule, rebuilt only when g_cols changes. */
 static void draw_sep(void) {
-    ob(C_SEP); for (int i=0; i<g_cols; i++) ob(HL); ob(RS);
+    static char *cache = NULL;
+    static int cache_cols = -1, cache_len = 0;
+    if (cache_cols != g_cols) {
+        size_t need = sizeof(C_SEP) + (size_t)g_cols * (sizeof(HL) - 1) + sizeof(RS);
+        char *nc = xrealloc(cache, need);
+        if (!nc) {
+            ob(C_SEP); for (int i=0; i<g_cols; i++) ob(HL); ob(RS);
+            return;
+        }
+        cache = nc;
+        char *p = cache;
+        memcpy(p, C_SEP, sizeof(C_SEP) - 1); p += sizeof(C_SEP) - 1;
+        for (int i = 0; i < g_cols; i++) { memcpy(p, HL, sizeof(HL) - 1); p += sizeof(HL) - 1; }
+        memcpy(p, RS, sizeof(RS) - 1); p += sizeof(RS) - 1;
+        cache_len = (int)(p - cache);
+        cache_cols = g_cols;
+    }
+    ob_raw(cache, cache_len);
 }
 
 static void draw_status(int tok, double pct, int cl) {
@@ -4958,6 +5541,16 @@ static void draw_status(int tok, double pct, int cl) {
     ob(RS);
     if (tok <= 0) return;
 
+    /* The ctx gauge only changes with usage or width; reuse the last one. */
+    static char cache[512];
+    static int c_tok = -1, c_cl = -1, c_cols = -1, c_pad = 0;
+    static double c_pct = -1.0;
+    if (tok == c_tok && pct == c_pct && cl == c_cl && g_cols == c_cols) {
+        obf("%*s", c_pad, "");
+        ob(cache);
+        return;
+    }
+
     static const char *bar_levels[] = { " ", "\xe2\x96\x8f", "\xe2\x96\x8e", "\xe2\x96\x8d", "\xe2\x96\x8c", "\xe2\x96\x8b", "\xe2\x96\x8a", "\xe2\x96\x89", "\xe2\x96\x88" };
     int bw = 8;
     double scaled = pct / 100.0 * bw * 8.0;
@@ -4971,24 +5564,24 @@ static void draw_status(int tok, double pct, int cl) {
     int pad = g_cols - bvl - svl - cvl;
     if (pad<0) pad=0;
 
-    obf("%*s" DI "  " DOT "  " RS, pad, "");
-    ob(C_HDM "ctx " RS);
-    for (int i = 0; i < bw; i++) {
+    int n = snprintf(cache, sizeof(cache), DI "  " DOT "  " RS C_HDM "ctx " RS);
+    for (int i = 0; i < bw && n < (int)sizeof(cache); i++) {
         double rem = scaled - (double)(i * 8);
         int level = (int)(rem + 0.0001);
         if (level < 0) level = 0;
         if (level > 8) level = 8;
-        if (i == 0) ob(C_SEP "[");
-        if (level > 0) {
-            const char *segc = (i < 4) ? C_BRG : (i < 6) ? C_BRY : C_BRR;
-            ob(segc);
-            ob(bar_levels[level]);
-        } else {
-            ob(C_SEP DOT);
-        }
-        if (i == bw - 1) ob(C_SEP "]");
+        const char *segc = (i < 4) ? C_BRG : (i < 6) ? C_BRY : C_BRR;
+        n += snprintf(cache + n, sizeof(cache) - (size_t)n, "%s%s%s%s",
+                      i == 0 ? C_SEP "[" : "",
+                      level > 0 ? segc : C_SEP DOT,
+                      level > 0 ? bar_levels[level] : "",
+                      i == bw - 1 ? C_SEP "]" : "");
     }
-    ob(RS DI " "); ob(ct); ob(RS);
+    if (n < (int)sizeof(cache))
+        snprintf(cache + n, sizeof(cache) - (size_t)n, RS DI " %s" RS, ct);
+    c_tok = tok; c_pct = pct; c_cl = cl; c_cols = g_cols; c_pad = pad;
+    obf("%*s", pad, "");
+    ob(cache);
 }
 
 static void draw_queue_panel(void) {
@@ -4998,10 +5591,8 @@ static void draw_queue_panel(void) {
     if (qsep_row < 2) qsep_row = 2;
 
     obf("\033[%d;1H", qsep_row);
-    ob(C_SEP);
-    for (int i = 0; i < g_cols; i++) ob(HL);
-    ob(RS);
-    ob("\033[K");
+    draw_sep();
+    if (!g_cols_full) ob("\033[K");
 
     int row = qsep_row + 1;
     int item_rows = g_queue.n;
@@ -5010,7 +5601,7 @@ static void draw_queue_panel(void) {
 
     if (g_queue.n > 0) {
         obf("\033[%d;1H", row++);
-        ob(C_QBG);
+        OB_LIT(C_QBG);
         obf("  " BUL " Queue(%d)", g_queue.n);
         if (g_edit_index >= 0) ob(C_QACC "  editing history" RS C_QBG);
         else if (g_input_draft_saved) ob(C_QACC "  draft stashed" RS C_QBG);
@@ -5030,7 +5621,7 @@ static void draw_queue_panel(void) {
     for (int i = 0; i < item_rows; i++) {
         int idx = g_queue.scroll_off + i;
         obf("\033[%d;1H", row++);
-        ob(C_QBG);
+        OB_LIT(C_QBG);
         if (idx < g_queue.n) {
             char compact[1024];
             int max_chars = g_cols - 12;
@@ -5095,7 +5686,7 @@ static void draw_queue_panel(void) {
         obf("\033[%d;1H", row++);
         ob("  ");
         ob(C_QACC); ob(VL); ob(RS);
-        ob(C_QBG);
+        OB_LIT(C_QBG);
 
         for (int pos = start; pos < end;) {
             int next = input_next_boundary(g_input_buf, end, pos);
@@ -5177,15 +5768,34 @@ static void draw_hotkeys_footer(void) {
     ob(RS);
 }
 
+/* Move to column 1 of row g_rows - up (up <= 3); escapes rebuilt per g_rows. */
+static void ob_foot_row(int up) {
+    static char seq[4][16];
+    static int len[4], cache_rows = -1;
+    if (cache_rows != g_rows) {
+        for (int i = 0; i < 4; i++)
+            len[i] = snprintf(seq[i], sizeof(seq[i]), "\033[%d;1H", g_rows - i);
+        cache_rows = g_rows;
+    }
+    ob_raw(seq[up], len[up]);
+}
+
+/* A row ending exactly at the last column has nothing left to erase. */
+static int row_needs_erase(int end_col) {
+    return !g_cols_full || end_col < g_cols;
+}
+
 static void draw(Lines *L, int off, int tok, double pct, int cl, int first) {
     g_ol = 0;
     link_map_clear();
-    if (g_sync_enabled) { ob("\033[?2026h"); g_sync_begin_count++; }
+    if (g_sync_enabled) { OB_LIT("\033[?2026h"); g_sync_begin_count++; }
 
-    if (first) ob("\033[?25l\033[2J\033[H");
-    else       ob("\033[?25l\033[H");
+    if (first) OB_LIT("\033[?25l\033[2J\033[H");
+    else       OB_LIT("\033[?25l\033[H");
 
-    draw_sep(); ob("\033[K\n");
+    draw_sep();
+    if (!g_cols_full) OB_LIT("\033[K");
+    OB_LIT("\n");
     int row = 2;
 
     if (off > 0) {
@@ -5206,45 +5816,43 @@ static void draw(Lines *L, int off, int tok, double pct, int cl, int first) {
             row++;
             continue;
         }
-        (void)link_map_track_line(L->d[i], row);
+        int end_col;
+        (void)link_map_track_line(L->d[i], row, &end_col);
         emit_line_with_hover(L->d[i], row);
-        ob("\033[K\n");
+        if (row_needs_erase(end_col)) OB_LIT("\033[K");
+        OB_LIT("\n");
         row++;
     }
 
     int body_end = (g_queue_rows > 0) ? (g_rows - 3 - g_queue_rows) : (g_rows - 3);
     if (body_end < row) body_end = row;
-    while (row < body_end) { ob("\033[K\n"); row++; }
+    while (row < body_end) { OB_LIT("\033[K\n"); row++; }
 
     draw_queue_panel();
 
     if (g_queue_rows <= 0) {
-        obf("\033[%d;1H", g_rows - 3);
-        ob(C_SEP);
-        for (int i = 0; i < g_cols; i++) ob(HL);
-        ob(RS);
-        ob("\033[K");
-        obf("\033[%d;1H", g_rows - 2);
+        ob_foot_row(3);
+        draw_sep();
+        if (!g_cols_full) OB_LIT("\033[K");
+        ob_foot_row(2);
         draw_status(tok, pct, cl);
-        ob("\033[K");
-        obf("\033[%d;1H", g_rows - 1);
-        ob(C_QBG);
-        ob("\033[K");
-        obf("\033[%d;1H", g_rows); draw_hotkeys_footer();
-        ob("\033[K");
+        OB_LIT("\033[K");
+        ob_foot_row(1);
+        OB_LIT(C_QBG);
+        OB_LIT("\033[K");
+        ob_foot_row(0); draw_hotkeys_footer();
+        OB_LIT("\033[K");
     } else {
-        obf("\033[%d;1H", g_rows - 2);
-        ob(C_SEP);
-        for (int i = 0; i < g_cols; i++) ob(HL);
-        ob(RS);
-        ob("\033[K");
-        obf("\033[%d;1H", g_rows - 1);
+        ob_foot_row(2);
+        draw_sep();
+        if (!g_cols_full) OB_LIT("\033[K");
+        ob_foot_row(1);
         draw_status(tok, pct, cl);
-        ob("\033[K");
-        obf("\033[%d;1H", g_rows); draw_hotkeys_footer();
-        ob("\033[K");
+        OB_LIT("\033[K");
+        ob_foot_row(0); draw_hotkeys_footer();
+        OB_LIT("\033[K");
     }
-    if (g_sync_enabled) { ob("\033[?2026l"); g_sync_end_count++; }
+    if (g_sync_enabled) { OB_LIT("\033[?2026l"); g_sync_end_count++; }
 
     ob_flush();
 }
@@ -5270,15 +5878,113 @@ static void term_restore(void) {
     if (g_fd < 0) return;
     if (g_restored) return;
     g_restored = 1;
-    write_all(g_fd, "\033[?2026l", strlen("\033[?2026l"));
+    /* one write so the unwind can't be split by a dying tty */
+    static const char seq_mouse[] = "\033[?2026l" MOUSE_OFF "\033[?25h";
+    static const char seq_plain[] = "\033[?2026l\033[?25h";
+    if (g_mouse_enabled) write_all(g_fd, seq_mouse, sizeof(seq_mouse) - 1);
+    else write_all(g_fd, seq_plain, sizeof(seq_plain) - 1);
     g_sync_unwind_end_count++;
-    if (g_mouse_enabled) write_all(g_fd, MOUSE_OFF, strlen(MOUSE_OFF));
-    write_all(g_fd, "\033[?25h", 6);
     if (g_term_saved && g_term_raw) tcsetattr(g_fd, TCSANOW, &g_old);
     g_term_raw = 0;
     g_mouse_enabled = 0;
 }
 
+/* ── Transcript watch ──────────────────────────────────────────────────── */
+
+/* kqueue/inotify descriptor that turns readable when the transcript is
+ * written, so the loop can sleep longer between ticks.  Events only make
+ * reloads faster: the file is still stat'ed on a slow fallback timer, so
+ * a missed event (or no watcher at all) costs latency, not correctness. */
+#define WATCH_IDLE_MS     100
+#define WATCH_FALLBACK_US 500000
+
+static int g_watch_fd = -1;
+static int g_watch_file_fd = -1;
+static int g_watch_fired = 0;
+
+static void transcript_watch_close(void) {
+    if (g_watch_fd >= 0) close(g_watch_fd);
+    if (g_watch_file_fd >= 0) close(g_watch_file_fd);
+    g_watch_fd = g_watch_file_fd = -1;
+}
+
+static void transcript_watch_open(const char *path) {
+    transcript_watch_close();
+#if defined(__APPLE__)
+    int kq = kqueue();
+    if (kq < 0) return;
+    int ffd = open(path, O_EVTONLY | O_CLOEXEC);
+    if (ffd < 0) { close(kq); return; }
+    struct kevent ev;
+    EV_SET(&ev, ffd, EVFILT_VNODE, EV_ADD | EV_CLEAR,
+           NOTE_WRITE | NOTE_EXTEND | NOTE_ATTRIB | NOTE_DELETE | NOTE_RENAME, 0, NULL);
+    if (kevent(kq, &ev, 1, NULL, 0, NULL) < 0) { close(ffd); close(kq); return; }
+    fcntl(kq, F_SETFD, FD_CLOEXEC);
+    g_watch_fd = kq;
+    g_watch_file_fd = ffd;
+#elif defined(__linux__)
+    int in = inotify_init1(IN_NONBLOCK | IN_CLOEXEC);
+    if (in < 0) return;
+    if (inotify_add_watch(in, path, IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE |
+                                    IN_MOVE_SELF | IN_DELETE_SELF) < 0) {
+        close(in);
+        return;
+    }
+    g_watch_fd = in;
+#else
+    (void)path;
+#endif
+    PDBG("transcript watch %s\n", g_watch_fd >= 0 ? "on" : "unavailable");
+}
+
+static void transcript_watch_drain(void) {
+#if defined(__APPLE__)
+    struct kevent evs[8];
+    struct timespec zero = {0, 0};
+    while (kevent(g_watch_fd, NULL, 0, evs, 8, &zero) > 0) {}
+#else
+    char b[4096];
+    while (read(g_watch_fd, b, sizeof(b)) > 0) {}
+#endif
+    g_watch_fired = 1;
+}
+
+/* Editor exit as an fd event (pidfd / EVFILT_PROC) rather than a
+ * kill(pid, 0) probe every tick; falls back to the probe without one. */
+static int g_editor_fd = -1;
+static int g_editor_gone = 0;
+
+static void editor_watch_open(pid_t pid) {
+    if (pid <= 0) return;
+#if defined(__APPLE__)
+    int kq = kqueue();
+    if (kq < 0) return;
+    struct kevent ev;
+    EV_SET(&ev, pid, EVFILT_PROC, EV_ADD | EV_ONESHOT, NOTE_EXIT, 0, NULL);
+    if (kevent(kq, &ev, 1, NULL, 0, NULL) < 0) { close(kq); return; }
+    fcntl(kq, F_SETFD, FD_CLOEXEC);
+    g_editor_fd = kq;
+#elif defined(__linux__) && defined(SYS_pidfd_open)
+    int fd = (int)syscall(SYS_pidfd_open, pid, 0);
+    if (fd < 0) return;
+    fcntl(fd, F_SETFD, FD_CLOEXEC);
+    g_editor_fd = fd;
+#endif
+    PDBG("editor watch %s\n", g_editor_fd >= 0 ? "on" : "unavailable");
+}
+
+static void editor_watch_close(void) {
+    if (g_editor_fd >= 0) close(g_editor_fd);
+    g_editor_fd = -1;
+    g_editor_gone = 0;
+}
+
+static int editor_alive(pid_t pid) {
+    if (pid <= 0) return 1;
+    if (g_editor_fd >= 0) return !g_editor_gone;
+    return kill(pid, 0) == 0;
+}
+
 /* ── Input ─────────────────────────────────────────────────────────────── */
 
 #define INP_NONE 0
@@ -5422,6 +6128,121 @@ static int decode_escape_key(const unsigned char *buf, ssize_t n) {
     return INP_NONE;
 }
 
+/* Length of the escape sequence at buf[0] (CSI/SS3 through the final
+ * byte, otherwise ESC plus one byte), or 0 if it is cut off. */
+static ssize_t escape_seq_len(const unsigned char *buf, ssize_t n) {
+    if (n < 2 || buf[0] != 0x1b) return 0;
+    if (buf[1] == 'O') return n >= 3 ? 3 : 0;
+    if (buf[1] != '[') return 2;
+    for (ssize_t i = 2; i < n; i++) {
+        if (buf[i] >= 0x40 && buf[i] <= 0x7e) return i + 1;
+    }
+    return 0;
+}
+
+/* Events decoded from the same read as the one poll_input returned.
+ * Terminals batch wheel ticks and key repeats, so one read often holds
+ * several complete sequences. */
+typedef struct { int ev, steps, x, y; } InputEvent;
+static InputEvent g_inp_queue[64];
+static int g_inp_queue_len = 0;
+static int g_inp_queue_pos = 0;
+static int g_wheel_steps = 1; /* lines for the INP_WHEEL_* just returned */
+
+static int inp_is_wheel(int ev) {
+    return ev == INP_WHEEL_UP || ev == INP_WHEEL_DOWN;
+}
+
+static int inp_is_delta(int ev, int input_mode) {
+    return !input_mode && ev != INP_NONE && ev > -INP_HOME && ev < INP_HOME;
+}
+
+/* Adjacent scroll events collapse into one entry so a burst costs a
+ * single scroll and redraw instead of one per tick. */
+static void inp_queue_push(int ev, int input_mode) {
+    if (g_inp_queue_len > g_inp_queue_pos) {
+        InputEvent *last = &g_inp_queue[g_inp_queue_len - 1];
+        if (inp_is_wheel(ev) && inp_is_wheel(last->ev)) {
+            last->steps += (ev == INP_WHEEL_UP) ? -1 : 1;
+            last->ev = last->steps < 0 ? INP_WHEEL_UP : INP_WHEEL_DOWN;
+            last->x = g_mouse_x;
+            last->y = g_mouse_y;
+            if (last->steps == 0) g_inp_queue_len--;
+            return;
+        }
+        if (inp_is_delta(ev, input_mode) && inp_is_delta(last->ev, input_mode)) {
+            /* Keep the sum a delta; past ±INP_HOME it would decode as a key. */
+            int sum = last->ev + ev;
+            if (sum >= INP_HOME) sum = INP_HOME - 1;
+            if (sum <= -INP_HOME) sum = -(INP_HOME - 1);
+            last->ev = sum;
+            if (last->ev == 0) g_inp_queue_len--;
+            return;
+        }
+    }
+    if (g_inp_queue_len >= (int)(sizeof(g_inp_queue) / sizeof(g_inp_queue[0]))) return;
+    InputEvent *e = &g_inp_queue[g_inp_queue_len++];
+    e->ev = ev;
+    e->steps = (ev == INP_WHEEL_UP) ? -1 : 1;
+    e->x = g_mouse_x;
+    e->y = g_mouse_y;
+}
+
+static int inp_queue_pop(void) {
+    if (g_inp_queue_pos >= g_inp_queue_len) {
+        g_inp_queue_len = g_inp_queue_pos = 0;
+        return INP_NONE;
+    }
+    InputEvent *e = &g_inp_queue[g_inp_queue_pos++];
+    g_mouse_x = e->x;
+    g_mouse_y = e->y;
+    if (inp_is_wheel(e->ev)) g_wheel_steps = e->steps < 0 ? -e->steps : e->steps;
+    return e->ev;
+}
+
+/* Decode one mouse or key sequence.  *matched is set when buf was
+ * recognised, even if the key does nothing in the current mode. */
+static int decode_input_seq(const unsigned char *buf, ssize_t n, int input_mode, int *matched) {
+    *matched = 1;
+    int mouse_ev = decode_sgr_mouse(buf, n);
+    if (mouse_ev != INP_NONE) return mouse_ev;
+
+    int esc_ev = decode_escape_key(buf, n);
+    if (esc_ev == INP_NONE) {
+        *matched = 0;
+        return INP_NONE;
+    }
+    if (input_mode && (esc_ev == INP_NEWLINE || esc_ev == INP_ENTER)) {
+        pdebug_input_bytes("input esc decoded", buf, n);
+    }
+    if (!input_mode) return esc_ev;
+    if (esc_ev == -1 || esc_ev == 1 || esc_ev == INP_LEFT || esc_ev == INP_RIGHT ||
+        esc_ev == INP_HOME || esc_ev == INP_END || esc_ev == INP_QCYCLE_UP ||
+        esc_ev == INP_QCYCLE_DOWN || esc_ev == INP_QDELETE || esc_ev == INP_ENTER ||
+        esc_ev == INP_NEWLINE) {
+        return esc_ev;
+    }
+    return INP_NONE;
+}
+
+/* Queue every event in a buffer made only of complete escape sequences.
+ * Returns 0 (queueing nothing) if the buffer holds anything else. */
+static int decode_input_seqs(const unsigned char *buf, ssize_t n, int input_mode) {
+    ssize_t i = 0, len;
+    while (i < n) {
+        if (!(len = escape_seq_len(buf + i, n - i))) return 0;
+        i += len;
+    }
+    if (escape_seq_len(buf, n) == n) return 0;
+    for (i = 0; i < n; i += len) {
+        len = escape_seq_len(buf + i, n - i);
+        int matched = 0;
+        int ev = decode_input_seq(buf + i, len, input_mode, &matched);
+        if (ev != INP_NONE && ev != INP_MOUSE_IGNORE) inp_queue_push(ev, input_mode);
+    }
+    return 1;
+}
+
 static ssize_t read_escape_suffix(int fd, unsigned char *buf, ssize_t n, size_t cap) {
     if (!buf || n <= 0 || (size_t)n >= cap) return n;
     if (buf[0] != 0x1b) return n;
@@ -5450,6 +6271,8 @@ static ssize_t read_escape_suffix(int fd, unsigned char *buf, ssize_t n, size_t
 }
 
 static int poll_input(int fd, int timeout_ms, int input_mode) {
+    g_wheel_steps = 1;
+    if (g_inp_queue_pos < g_inp_queue_len) return inp_queue_pop();
     if (input_mode) {
         int pc = input_pending_pop();
         if (pc >= 0) return INP_CHAR_BASE + pc;
@@ -5461,31 +6284,37 @@ static int poll_input(int fd, int timeout_ms, int input_mode) {
     tv.tv_sec = timeout_ms / 1000;
     tv.tv_usec = (timeout_ms % 1000) * 1000;
     FD_ZERO(&fds); FD_SET(fd, &fds);
-    if (select(fd+1, &fds, NULL, NULL, &tv) <= 0) return INP_NONE;
+    int maxfd = fd;
+    if (g_wake_fd[0] >= 0) {
+        FD_SET(g_wake_fd[0], &fds);
+        if (g_wake_fd[0] > maxfd) maxfd = g_wake_fd[0];
+    }
+    if (g_watch_fd >= 0) {
+        FD_SET(g_watch_fd, &fds);
+        if (g_watch_fd > maxfd) maxfd = g_watch_fd;
+    }
+    if (g_editor_fd >= 0 && !g_editor_gone) {
+        FD_SET(g_editor_fd, &fds);
+        if (g_editor_fd > maxfd) maxfd = g_editor_fd;
+    }
+    if (select(maxfd+1, &fds, NULL, NULL, &tv) <= 0) return INP_NONE;
+    if (g_wake_fd[0] >= 0 && FD_ISSET(g_wake_fd[0], &fds)) drain_wake_fd();
+    if (g_watch_fd >= 0 && FD_ISSET(g_watch_fd, &fds)) transcript_watch_drain();
+    if (g_editor_fd >= 0 && !g_editor_gone && FD_ISSET(g_editor_fd, &fds)) g_editor_gone = 1;
+    if (!FD_ISSET(fd, &fds)) return INP_NONE;
 
     char buf[256];
     ssize_t n = read(fd, buf, sizeof(buf));
     if (n <= 0) return INP_NONE;
-    if ((unsigned char)buf[0] == 0x1b) n = read_escape_suffix(fd, (unsigned char *)buf, n, sizeof(buf));
-
-    int mouse_ev = decode_sgr_mouse((const unsigned char *)buf, n);
-    if (mouse_ev != INP_NONE) return mouse_ev;
-
-    int esc_ev = decode_escape_key((const unsigned char *)buf, n);
-    if (esc_ev != INP_NONE) {
-        if (input_mode && (esc_ev == INP_NEWLINE || esc_ev == INP_ENTER)) {
-            pdebug_input_bytes("input esc decoded", (const unsigned char *)buf, n);
-        }
-        if (!input_mode) return esc_ev;
-        if (esc_ev == -1 || esc_ev == 1 || esc_ev == INP_LEFT || esc_ev == INP_RIGHT ||
-            esc_ev == INP_HOME || esc_ev == INP_END || esc_ev == INP_QCYCLE_UP ||
-            esc_ev == INP_QCYCLE_DOWN || esc_ev == INP_QDELETE || esc_ev == INP_ENTER ||
-            esc_ev == INP_NEWLINE) {
-            return esc_ev;
-        }
-        return INP_NONE;
+    if ((unsigned char)buf[0] == 0x1b) {
+        n = read_escape_suffix(fd, (unsigned char *)buf, n, sizeof(buf));
+        if (decode_input_seqs((const unsigned char *)buf, n, input_mode)) return inp_queue_pop();
     }
 
+    int matched = 0;
+    int seq_ev = decode_input_seq((const unsigned char *)buf, n, input_mode, &matched);
+    if (matched) return seq_ev;
+
     if (input_mode) {
         if (n == 1) {
             unsigned char c = (unsigned char)buf[0];
@@ -5568,6 +6397,7 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
     if (g_bench_mode) PDBG("bench probes enabled\n");
 
     install_signal_handlers();
+    editor_watch_open(editor_pid);
 
     geo_update();
     if (term_raw(tty_fd) != 0) {
@@ -5595,6 +6425,9 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
     int prev_had_capped_banner = 0;
     int load_seq = 0;
     FileStamp st = {0};
+    long long last_stat_us = 0;
+    Transcript tr; memset(&tr, 0, sizeof(tr));
+    ItemLines il; memset(&il, 0, sizeof(il));
     int default_render_cap = g_perf_compat ? 0 : 20000;
     int max_render_lines = parse_env_int_range("CLAUDE_PAGER_MAX_RENDER_LINES", 0, 2000000, default_render_cap);
     if (max_render_lines > 0) {
@@ -5603,37 +6436,50 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
     }
 
     while (!g_quit) {
-        if (editor_pid > 0 && kill(editor_pid, 0) != 0) break;
+        if (!editor_alive(editor_pid)) break;
 
+        /* Row-only resizes just redraw; a column change rewraps the
+         * already-parsed items without touching the file. */
+        int rewrap = 0;
         if (g_resize) {
-            g_resize = 0; geo_update();
+            g_resize = 0;
+            geo_update();
+            /* Compare against the width L was wrapped for: queue_recalc_rows
+             * also calls geo_update and may have seen the new width first. */
+            rewrap = st.valid && il.cols != g_cols;
             queue_recalc_rows();
             first = 1;
         }
 
         int cc = 0;
-        if (transcript && transcript[0]) {
-            if (file_stamp_changed(transcript, &st)) {
+        long long now = now_us();
+        int stat_due = rewrap || g_watch_fd < 0 || g_watch_fired ||
+                       now - last_stat_us >= WATCH_FALLBACK_US || now < last_stat_us;
+        if (transcript && transcript[0] && stat_due) {
+            g_watch_fired = 0;
+            last_stat_us = now;
+            int changed = file_stamp_changed(transcript, &st);
+            if (changed || rewrap) {
                 cc = 1;
                 load_seq++;
-                Items items; memset(&items, 0, sizeof(items));
-                tok = 0; pct = 0;
-                long long t_parse0 = now_us();
-                PDBG("parse start load=%d\n", load_seq);
-                parse_transcript(transcript, &items, &tok, &pct, ctx_limit);
-                long long t_parse1 = now_us();
-                PDBG("parse end load=%d duration=%.2fms tok=%d pct=%.3f\n",
-                     load_seq, (double)(t_parse1 - t_parse0) / 1000.0, tok, pct);
-                L_free(&L);
+                int full = 0;
+                if (changed) {
+                    tok = 0; pct = 0;
+                    long long t_parse0 = now_us();
+                    PDBG("parse start load=%d offset=%lld\n", load_seq, (long long)tr.off);
+                    full = parse_transcript(&tr, transcript);
+                    if (full) transcript_watch_open(transcript);
+                    transcript_usage(&tr, &tok, &pct, ctx_limit);
+                    long long t_parse1 = now_us();
+                    PDBG("parse end load=%d duration=%.2fms full=%d items=%d tok=%d pct=%.3f\n",
+                         load_seq, (double)(t_parse1 - t_parse0) / 1000.0, full, tr.items.n, tok, pct);
+                }
                 long long t_render0 = now_us();
                 PDBG("markdown render start load=%d\n", load_seq);
-                render_items(&L, &items);
+                int from = render_transcript(&L, &tr.items, full ? 0 : tr.dirty_from,
+                                             &il, prev_had_capped_banner);
+                tr.dirty_from = tr.items.n;
                 long long t_render1 = now_us();
-                L_push(&L, C_HDM "  " EMD " end of transcript " EMD RS);
-                L_push(&L, ""); L_push(&L, "");
-                if (L.max_keep > 0 && L.n > L.max_keep) {
-                    L_drop_head(&L, L.n - L.max_keep);
-                }
                 int new_dropped_total = L.dropped_total;
                 int new_had_capped_banner = new_dropped_total > 0 ? 1 : 0;
                 if (!first) {
@@ -5647,9 +6493,6 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
                     }
                 }
                 if (new_had_capped_banner) {
-                    char db[128];
-                    snprintf(db, sizeof(db), "  " C_HDM ELL " (+%d older lines capped)" RS, new_dropped_total);
-                    L_prepend(&L, db);
                     g_last_capped_lines = new_dropped_total;
                     PDBG("render cap dropped=%d keep=%d\n", new_dropped_total, L.n);
                 } else {
@@ -5657,9 +6500,8 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
                 }
                 prev_dropped_total = new_dropped_total;
                 prev_had_capped_banner = new_had_capped_banner;
-                PDBG("markdown render end load=%d duration=%.2fms lines=%d\n",
-                     load_seq, (double)(t_render1 - t_render0) / 1000.0, L.n);
-                I_free(&items);
+                PDBG("markdown render end load=%d from=%d duration=%.2fms lines=%d\n",
+                     load_seq, from, (double)(t_render1 - t_render0) / 1000.0, L.n);
                 if (off < 0) off = 0;
                 if (off >= L.n) off = L.n > 0 ? (L.n - 1) : 0;
                 if (!uscroll) {
@@ -5670,14 +6512,17 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
                     off = normalize_off_visual(&L, off, -1);
                 }
             }
-        } else if (first) {
+        } else if (first && !st.valid && L.n == 0) {
             cc = 1;
             L_push(&L, C_HDM "(transcript not found)" RS);
         }
 
         if (queue_load_from_disk()) cc = 1;
 
-        int inp = poll_input(tty_fd, (cc || first) ? 0 : 20, g_input_mode);
+        /* The queue file is still polled (the Stop hook pops from it), so
+         * only sleep longer when there is no queue file to watch. */
+        int idle_ms = (g_watch_fd >= 0 && !g_queue_stamp.valid) ? WATCH_IDLE_MS : 20;
+        int inp = poll_input(tty_fd, (cc || first) ? 0 : idle_ms, g_input_mode);
         int sc = 0;
 
         if (inp == INP_CTRL_QUIT) {
@@ -5875,7 +6720,7 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
             } else if (inp == INP_MOUSE_IGNORE) {
                 inp = INP_NONE;
             } else if (inp == INP_WHEEL_UP || inp == INP_WHEEL_DOWN) {
-                int delta = (inp == INP_WHEEL_UP) ? -1 : 1;
+                int delta = (inp == INP_WHEEL_UP) ? -g_wheel_steps : g_wheel_steps;
                 off += delta;
                 if (off < 0) off = 0;
                 int mx = L.n > 0 ? L.n - 1 : 0;
@@ -5937,7 +6782,7 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
             else if (inp == INP_END) { int b=L.n-(g_crows-1); off=b>0?b:0; off = normalize_off_visual(&L, off, -1); uscroll=0; sc=1; }
             else if (inp == INP_MOUSE_IGNORE) { inp = INP_NONE; }
             else if (inp == INP_WHEEL_UP || inp == INP_WHEEL_DOWN) {
-                int delta = (inp == INP_WHEEL_UP) ? -1 : 1;
+                int delta = (inp == INP_WHEEL_UP) ? -g_wheel_steps : g_wheel_steps;
                 off += delta;
                 if (off<0) off=0;
                 int mx = L.n>0 ? L.n-1 : 0;
@@ -5983,6 +6828,10 @@ void run_pager(int tty_fd, const char *transcript, int editor_pid, int ctx_limit
     PDBG("run end sync_begin=%d sync_end=%d sync_unwind_end=%d oom=%d\n",
          g_sync_begin_count, g_sync_end_count, g_sync_unwind_end_count, g_oom);
     L_free(&L);
+    transcript_reset(&tr);
+    transcript_watch_close();
+    editor_watch_close();
+    IL_free(&il);
     link_map_clear();
     queue_clear_items();
 }
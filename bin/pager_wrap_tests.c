@@ -44,7 +44,7 @@ static int current_rows_consumed(const Lines *l) {
             row++;
             continue;
         }
-        (void)link_map_track_line(l->d[i], row);
+        (void)link_map_track_line(l->d[i], row, NULL);
         row++;
     }
     return row - 2;
@@ -54,7 +54,7 @@ static int legacy_rows_consumed(const Lines *l) {
     int row = 2;
     link_map_clear();
     for (int i = 0; i < l->n; i++) {
-        int used_rows = link_map_track_line(l->d[i], row);
+        int used_rows = link_map_track_line(l->d[i], row, NULL);
         row += (used_rows > 0 ? used_rows : 1);
     }
     return row - 2;
@@ -74,6 +74,88 @@ static void test_wrap_slots_mark_placeholders(void) {
     L_free(&l);
 }
 
+static void test_wrap_counts_code_points_not_bytes(void) {
+    reset_render_state(10);
+    Lines l;
+    L_init(&l);
+    L_pushw(&l, "\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9"
+                "\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9\xc3\xa9");
+
+    assert_int_eq(vlen(l.d[0], NULL), 15, "two-byte code points should count one cell each");
+    assert_int_eq(l.n, 2, "fifteen cells at width ten should reserve two slots");
+
+    L_free(&l);
+}
+
+static void test_wrap_counts_wide_code_points_twice(void) {
+    reset_render_state(10);
+    Lines l;
+    L_init(&l);
+    /* six CJK ideographs (U+6F22 U+5B57 x3) = twelve cells */
+    L_pushw(&l, "\xe6\xbc\xa2\xe5\xad\x97\xe6\xbc\xa2\xe5\xad\x97\xe6\xbc\xa2\xe5\xad\x97");
+
+    assert_int_eq(vlen(l.d[0], NULL), 12, "wide code points should count two cells each");
+    assert_int_eq(l.n, 2, "twelve cells at width ten should reserve two slots");
+    assert_int_eq(vlen("a\xe2\x94\x80" "b", NULL), 3, "box drawing should stay one cell");
+
+    L_free(&l);
+}
+
+static void test_wrap_moves_wide_char_off_last_column(void) {
+    reset_render_state(3);
+    Lines l;
+    L_init(&l);
+    /* each ideograph needs two cells; the second would straddle column 3 */
+    L_pushw(&l, "\xe6\xbc\xa2\xe6\xbc\xa2\xe6\xbc\xa2");
+
+    assert_int_eq(l.n, 3, "wide char at the boundary should start a new row");
+    assert_int_eq(link_map_track_line(l.d[0], 2, NULL), l.n, "reserved slots should match drawn rows");
+    L_free(&l);
+
+    /* 50 ideographs fill 100 of 101 columns; the 51st wraps */
+    reset_render_state(101);
+    L_init(&l);
+    char wide[151 * 3 + 1];
+    for (int i = 0; i < 151; i++) memcpy(wide + i * 3, "\xe6\xbc\xa2", 3);
+    wide[151 * 3] = '\0';
+    L_pushw(&l, wide);
+    assert_int_eq(l.n, 4, "151 wide chars at width 101 should take four rows");
+    assert_int_eq(link_map_track_line(l.d[0], 2, NULL), l.n, "reserved slots should match drawn rows");
+
+    L_free(&l);
+}
+
+static void test_full_rows_skip_erase_only_when_exact(void) {
+    reset_render_state(10);
+    g_cols_full = 1;
+    int end_col;
+
+    link_map_track_line("abcdefghij", 2, &end_col);
+    assert_true(!row_needs_erase(end_col), "full ASCII row should skip the erase");
+    link_map_track_line("\033[1mabcdefghij\033[0m", 2, &end_col);
+    assert_true(!row_needs_erase(end_col), "escapes should not count toward the row");
+    link_map_track_line("abcdefghi", 2, &end_col);
+    assert_true(row_needs_erase(end_col), "short row should be erased");
+    /* U+0301 combining acute: may take no cell, so the width is not exact */
+    link_map_track_line("abcdefghi\xcc\x81", 2, &end_col);
+    assert_true(row_needs_erase(end_col), "combining mark should keep the erase");
+    link_map_track_line("abcdefgh\xe6\xbc\xa2", 2, &end_col);
+    assert_true(row_needs_erase(end_col), "non-ASCII row should keep the erase");
+
+    g_cols_full = 0;
+    link_map_track_line("abcdefghij", 2, &end_col);
+    assert_true(row_needs_erase(end_col), "clamped width should always erase");
+}
+
+static void test_escape_scanner_follows_ecma48(void) {
+    assert_int_eq(ansi_seq_len("\033[38;5;10mx", 64), 10, "CSI should end at its final byte");
+    assert_int_eq(ansi_seq_len("\033[200~x", 64), 6, "CSI with tilde final should end there");
+    assert_int_eq(ansi_seq_len("\033]8;;u\ax", 64), 7, "OSC should end at BEL");
+    assert_int_eq(ansi_seq_len("\033Pq\033\\x", 64), 5, "DCS should end at ST");
+    assert_int_eq(ansi_seq_len("\033[31\xc3\xa9", 64), 4, "CSI should stop at a byte outside its grammar");
+    assert_int_eq(vlen("\033[1mab\033[0m\033]8;;u\acd\033]8;;\a", NULL), 4, "vlen should skip every escape");
+}
+
 static void test_normalize_offset_skips_placeholders(void) {
     reset_render_state(10);
     Lines l;
@@ -124,12 +206,187 @@ static void test_unwrapped_line_is_stable(void) {
     L_free(&l);
 }
 
+static void test_input_batch_decodes_each_sequence(void) {
+    reset_render_state(80);
+    g_inp_queue_len = g_inp_queue_pos = 0;
+    const char *seq = "\033[<64;5;7M\033[<64;6;8M\033[H\033[<65;9;10M\033[F";
+    assert_int_eq(decode_input_seqs((const unsigned char *)seq, (ssize_t)strlen(seq), 0), 1,
+                  "batched sequences should decode");
+
+    assert_int_eq(inp_queue_pop(), INP_WHEEL_UP, "adjacent wheel ticks should merge");
+    assert_int_eq(g_wheel_steps, 2, "merged wheel should carry both steps");
+    assert_int_eq(g_mouse_x, 6, "merged wheel should keep the latest x");
+    assert_int_eq(g_mouse_y, 8, "merged wheel should keep the latest y");
+    assert_int_eq(inp_queue_pop(), INP_HOME, "Home should follow the wheel");
+    assert_int_eq(inp_queue_pop(), INP_WHEEL_DOWN, "wheel down should follow Home");
+    assert_int_eq(g_wheel_steps, 1, "single wheel tick should be one step");
+    assert_int_eq(g_mouse_x, 9, "wheel down should restore its own x");
+    assert_int_eq(g_mouse_y, 10, "wheel down should restore its own y");
+    assert_int_eq(inp_queue_pop(), INP_END, "End should come last");
+    assert_int_eq(inp_queue_pop(), INP_NONE, "queue should be drained");
+
+    char pgdn[64 * 4 + 1] = "";
+    for (int i = 0; i < 60; i++) strcat(pgdn, "\033[6~");
+    g_crows = 200;
+    assert_int_eq(decode_input_seqs((const unsigned char *)pgdn, (ssize_t)strlen(pgdn), 0), 1,
+                  "PgDn burst should decode");
+    assert_int_eq(inp_queue_pop(), INP_HOME - 1, "merged PgDn should stay a scroll delta");
+    assert_int_eq(inp_queue_pop(), INP_NONE, "PgDn burst should merge into one event");
+}
+
+static void append_file(const char *path, const char *s) {
+    FILE *f = fopen(path, "a");
+    assert_true(f != NULL, "transcript fixture should open");
+    fputs(s, f);
+    fclose(f);
+}
+
+static void test_transcript_parse_appends_incrementally(void) {
+    char path[] = "/tmp/pager_wrap_tests.XXXXXX";
+    int fd = mkstemp(path);
+    assert_true(fd >= 0, "transcript fixture should be created");
+    close(fd);
+
+    Transcript tr;
+    memset(&tr, 0, sizeof(tr));
+    append_file(path, "{\"type\":\"user\",\"message\":{\"content\":\"one\"}}\n");
+    assert_int_eq(parse_transcript(&tr, path), 1, "first load should be a full parse");
+    assert_int_eq(tr.items.n, 1, "first load should parse one item");
+
+    append_file(path, "{\"type\":\"user\",\"message\":{\"content\":\"two\"}}");
+    assert_int_eq(parse_transcript(&tr, path), 0, "append should parse incrementally");
+    assert_int_eq(tr.items.n, 2, "unterminated tail should still be shown");
+
+    append_file(path, "\n{\"type\":\"user\",\"message\":{\"content\":\"three\"}}\n");
+    assert_int_eq(parse_transcript(&tr, path), 0, "second append should parse incrementally");
+    assert_int_eq(tr.items.n, 3, "re-read tail should not duplicate items");
+    assert_true(strcmp(tr.items.d[2].text, "three") == 0, "appended item should be last");
+
+    assert_true(truncate(path, 0) == 0, "transcript fixture should truncate");
+    append_file(path, "{\"type\":\"user\",\"message\":{\"content\":\"new\"}}\n");
+    assert_int_eq(parse_transcript(&tr, path), 1, "shrunk file should be reparsed in full");
+    assert_int_eq(tr.items.n, 1, "full reparse should drop old items");
+
+    /* Rewritten in place to a larger size: `off` now lands mid-record. */
+    assert_true(truncate(path, 0) == 0, "transcript fixture should truncate");
+    append_file(path, "{\"type\":\"user\",\"message\":{\"content\":\"rewritten first\"}}\n"
+                      "{\"type\":\"user\",\"message\":{\"content\":\"rewritten second\"}}\n");
+    assert_int_eq(parse_transcript(&tr, path), 1, "larger rewrite should be reparsed in full");
+    assert_int_eq(tr.items.n, 2, "larger rewrite should hold only the new items");
+    assert_true(strcmp(tr.items.d[0].text, "rewritten first") == 0, "reparse should start at the top");
+
+    transcript_reset(&tr);
+    unlink(path);
+}
+
+static void assert_lines_match_full_render(const Lines *got, Items *items, int max_keep, const char *msg) {
+    Lines want;
+    L_init(&want);
+    L_set_limit(&want, max_keep);
+    ItemLines il;
+    memset(&il, 0, sizeof(il));
+    render_transcript(&want, items, 0, &il, 0);
+
+    assert_int_eq(got->n, want.n, msg);
+    assert_int_eq(got->dropped_total, want.dropped_total, msg);
+    for (int i = 0; i < want.n; i++) assert_true(strcmp(got->d[i], want.d[i]) == 0, msg);
+
+    IL_free(&il);
+    L_free(&want);
+}
+
+static void check_incremental_append(int max_keep) {
+    char path[] = "/tmp/pager_wrap_tests.XXXXXX";
+    int fd = mkstemp(path);
+    assert_true(fd >= 0, "transcript fixture should be created");
+    close(fd);
+
+    Transcript tr;
+    memset(&tr, 0, sizeof(tr));
+    Lines l;
+    L_init(&l);
+    L_set_limit(&l, max_keep);
+    ItemLines il;
+    memset(&il, 0, sizeof(il));
+
+    append_file(path, "{\"type\":\"user\",\"message\":{\"content\":\"one\"}}\n"
+                      "{\"type\":\"user\",\"message\":{\"content\":\"two\"}}\n"
+                      "{\"type\":\"user\",\"message\":{\"content\":\"three\"}}\n");
+    parse_transcript(&tr, path);
+    render_transcript(&l, &tr.items, 0, &il, 0);
+    tr.dirty_from = tr.items.n;
+    if (max_keep > 0) assert_true(l.dropped_total > 0, "fixture should overflow the line cap");
+
+    append_file(path, "{\"type\":\"user\",\"message\":{\"content\":\"four\"}}\n");
+    assert_int_eq(parse_transcript(&tr, path), 0, "append should parse incrementally");
+    int from = render_transcript(&l, &tr.items, tr.dirty_from, &il, l.dropped_total > 0);
+    assert_int_eq(from, 3, "append should re-render only the new item");
+    assert_lines_match_full_render(&l, &tr.items, max_keep, "appended render should match a full rebuild");
+
+    IL_free(&il);
+    L_free(&l);
+    transcript_reset(&tr);
+    unlink(path);
+}
+
+static void test_incremental_render_appends_match_full(void) {
+    reset_render_state(40);
+    check_incremental_append(0);
+    check_incremental_append(6);
+}
+
+static void test_incremental_render_relabel_matches_full(void) {
+    reset_render_state(40);
+    char path[] = "/tmp/pager_wrap_tests.XXXXXX";
+    int fd = mkstemp(path);
+    assert_true(fd >= 0, "transcript fixture should be created");
+    close(fd);
+
+    Transcript tr;
+    memset(&tr, 0, sizeof(tr));
+    Lines l;
+    L_init(&l);
+    ItemLines il;
+    memset(&il, 0, sizeof(il));
+
+    append_file(path, "{\"type\":\"assistant\",\"message\":{\"content\":[{\"type\":\"text\",\"text\":\"Editing.\"},"
+                      "{\"type\":\"tool_use\",\"name\":\"Edit\",\"input\":{\"file_path\":\"/tmp/x.py\"}}]}}\n");
+    parse_transcript(&tr, path);
+    render_transcript(&l, &tr.items, 0, &il, 0);
+    tr.dirty_from = tr.items.n;
+
+    append_file(path, "{\"type\":\"user\",\"toolUseResult\":{\"type\":\"update\",\"filePath\":\"/tmp/x.py\","
+                      "\"structuredPatch\":[{\"oldStart\":1,\"oldLines\":1,\"newStart\":1,\"newLines\":1,"
+                      "\"lines\":[\"-a\",\"+b\"]}]},"
+                      "\"message\":{\"content\":[{\"type\":\"tool_result\",\"content\":\"ok\"}]}}\n");
+    assert_int_eq(parse_transcript(&tr, path), 0, "tool result should parse incrementally");
+    assert_int_eq(tr.dirty_from, 1, "relabel should mark the Edit header dirty");
+    assert_true(strncmp(tr.items.d[1].text, "Update(", 7) == 0, "Edit header should be relabeled");
+    int from = render_transcript(&l, &tr.items, tr.dirty_from, &il, 0);
+    assert_int_eq(from, 1, "relabel should re-render from the header");
+    assert_lines_match_full_render(&l, &tr.items, 0, "relabeled render should match a full rebuild");
+
+    IL_free(&il);
+    L_free(&l);
+    transcript_reset(&tr);
+    unlink(path);
+}
+
 int main(void) {
     test_wrap_slots_mark_placeholders();
+    test_wrap_counts_code_points_not_bytes();
+    test_wrap_counts_wide_code_points_twice();
+    test_wrap_moves_wide_char_off_last_column();
+    test_escape_scanner_follows_ecma48();
+    test_full_rows_skip_erase_only_when_exact();
     test_normalize_offset_skips_placeholders();
     test_current_row_accounting_matches_slots();
     test_legacy_row_accounting_overcounts_wrapped_lines();
     test_unwrapped_line_is_stable();
+    test_input_batch_decodes_each_sequence();
+    test_transcript_parse_appends_incrementally();
+    test_incremental_render_appends_match_full();
+    test_incremental_render_relabel_matches_full();
     printf("ok\n");
     return 0;
 }